@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Employee, Attendance, Salary, Payment, Transaction, Notification
+from .models import User, Employee, Attendance, Salary, Payment, Transaction, Notification, PayrollRun, AttendanceMonthlySummary, Job
 
 # Admin site branding
 admin.site.site_header = "PayEase Admin"
@@ -33,6 +33,14 @@ class AttendanceAdmin(admin.ModelAdmin):
     date_hierarchy = 'date'
 
 
+@admin.register(AttendanceMonthlySummary)
+class AttendanceMonthlySummaryAdmin(admin.ModelAdmin):
+    list_display = ['employee', 'month', 'year', 'days_present', 'days_absent', 'days_on_leave', 'half_days']
+    list_filter = ['year', 'month']
+    search_fields = ['employee__full_name', 'employee__employee_id']
+    readonly_fields = ['days_present', 'days_absent', 'days_on_leave', 'half_days', 'updated_at']
+
+
 @admin.register(Salary)
 class SalaryAdmin(admin.ModelAdmin):
     list_display = ['employee', 'month', 'year', 'net_salary', 'is_paid']
@@ -63,3 +71,17 @@ class NotificationAdmin(admin.ModelAdmin):
     list_filter = ['notification_type', 'is_read', 'created_at']
     search_fields = ['employee__full_name', 'title', 'message']
     readonly_fields = ['created_at']
+
+
+@admin.register(PayrollRun)
+class PayrollRunAdmin(admin.ModelAdmin):
+    list_display = ['month', 'year', 'status', 'employees_processed', 'salaries_created', 'salaries_updated', 'started_at']
+    list_filter = ['status', 'year', 'month']
+    readonly_fields = ['last_employee_pk', 'started_at', 'updated_at', 'completed_at']
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'progress', 'total', 'attempts', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'name']
+    readonly_fields = ['locked_by', 'created_at', 'updated_at', 'started_at', 'finished_at']
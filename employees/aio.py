@@ -0,0 +1,34 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+def _on_own_connection(func):
+    def run():
+        try:
+            return func()
+        finally:
+            # Worker threads are reused; respect CONN_MAX_AGE like a request would
+            close_old_connections()
+    return run
+
+
+async def gather_queries(*funcs):
+    """
+    Run independent, read-only ORM callables at the same time.
+
+    Django's async ORM methods (aaggregate(), acount(), ...) all hop onto the
+    one thread-sensitive executor, so awaiting several together still runs
+    them one after another. Each callable here runs on its own worker
+    thread, with its own database connection. Results come back in order.
+    """
+    return await asyncio.gather(*(
+        sync_to_async(_on_own_connection(func), thread_sensitive=False)()
+        for func in funcs
+    ))
+
+
+async def run_in_thread(func, *args):
+    """Run CPU-bound work (calendar and Decimal shaping) off the event loop"""
+    return await sync_to_async(func, thread_sensitive=False)(*args)
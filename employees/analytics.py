@@ -0,0 +1,144 @@
+from decimal import Decimal
+import calendar
+
+from django.db.models import Count, Q, Sum
+
+from .models import Salary, Payment, AttendanceMonthlySummary
+
+
+PAYMENT_METHODS = [method for method, _ in Payment.PAYMENT_METHOD_CHOICES]
+
+
+def shift_month(year, month, delta):
+    """Return the (year, month) that is delta months away"""
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+def month_range(start, end):
+    """All (year, month) pairs from start to end, inclusive"""
+    year, month = start
+    while (year, month) <= tuple(end):
+        yield year, month
+        year, month = shift_month(year, month, 1)
+
+
+def period_filter(start, end):
+    """Q matching salaries whose (year, month) lies between start and end, inclusive"""
+    (start_year, start_month), (end_year, end_month) = start, end
+    # The plain year range lets the database seek the (year, month) index
+    return (
+        Q(year__gte=start_year, year__lte=end_year)
+        & (Q(year__gt=start_year) | Q(year=start_year, month__gte=start_month))
+        & (Q(year__lt=end_year) | Q(year=end_year, month__lte=end_month))
+    )
+
+
+def monthly_totals(start, end):
+    """
+    Salary totals for every month from start to end, inclusive.
+
+    start and end are (year, month) tuples. All figures come from a single
+    grouped query; months without salaries are filled with zeros. Each item
+    has year, month, label, paid, unpaid, employees and methods (paid total
+    per payment method).
+    """
+    return shape_monthly_totals(monthly_total_rows(start, end), start, end)
+
+
+def monthly_total_rows(start, end):
+    """The grouped query behind monthly_totals(), one row per month that has salaries"""
+    method_totals = {
+        f'method_{method}': Sum('net_salary', filter=Q(is_paid=True, payment__payment_method=method))
+        for method in PAYMENT_METHODS
+    }
+    rows = (
+        Salary.objects.filter(period_filter(start, end))
+        .order_by()
+        .values('year', 'month')
+        .annotate(
+            paid=Sum('net_salary', filter=Q(is_paid=True)),
+            unpaid=Sum('net_salary', filter=Q(is_paid=False)),
+            employees=Count('employee', distinct=True),
+            **method_totals,
+        )
+    )
+    return list(rows)
+
+
+def shape_monthly_totals(rows, start, end):
+    """Zero-fill and label the rows of monthly_total_rows()"""
+    by_month = {(row['year'], row['month']): row for row in rows}
+
+    zero = Decimal('0')
+    totals = []
+    for year, month in month_range(start, end):
+        row = by_month.get((year, month), {})
+        totals.append({
+            'year': year,
+            'month': month,
+            'label': calendar.month_abbr[month],
+            'paid': row.get('paid') or zero,
+            'unpaid': row.get('unpaid') or zero,
+            'employees': row.get('employees') or 0,
+            'methods': {method: row.get(f'method_{method}') or zero for method in PAYMENT_METHODS},
+        })
+    return totals
+
+
+def salary_totals():
+    """All-time paid and unpaid salary totals in one query"""
+    totals = Salary.objects.aggregate(
+        paid=Sum('net_salary', filter=Q(is_paid=True)),
+        unpaid=Sum('net_salary', filter=Q(is_paid=False)),
+    )
+    return totals['paid'] or 0, totals['unpaid'] or 0
+
+
+def annual_breakdown(rows, year):
+    """Month-by-month lines of the annual report from monthly_total_rows(), and their paid total"""
+    monthly_data = [
+        {
+            'month': calendar.month_name[data['month']],
+            'total': data['paid'],
+            'unpaid': data['unpaid'],
+            'employees': data['employees'],
+            'methods': data['methods'],
+        }
+        for data in shape_monthly_totals(rows, (year, 1), (year, 12))
+    ]
+    return monthly_data, sum(data['total'] for data in monthly_data)
+
+
+def annual_pivot(year):
+    """
+    Paid salaries of a year with one row per employee: tuples of
+    (employee id, name, January..December, total), months without a paid
+    salary being None.
+
+    Built by a single grouped query with the employee columns joined in;
+    rows are plain tuples, so no model instances are created. The template
+    loads them all at once: one row per employee with paid salaries.
+    """
+    months = {
+        f'month_{month}': Sum('net_salary', filter=Q(month=month))
+        for month in range(1, 13)
+    }
+    return (
+        Salary.objects.filter(year=year, is_paid=True)
+        .order_by()
+        .values('employee_id', 'employee__employee_id', 'employee__full_name')
+        .annotate(**months, total=Sum('net_salary'))
+        .order_by('employee__full_name', 'employee_id')
+        .values_list('employee__employee_id', 'employee__full_name', *months, 'total')
+    )
+
+
+def attendance_totals(year, month):
+    """Attendance day counts of all employees for a month, from the summary table"""
+    return AttendanceMonthlySummary.objects.filter(month=month, year=year).aggregate(
+        days_present=Sum('days_present'),
+        days_absent=Sum('days_absent'),
+        days_on_leave=Sum('days_on_leave'),
+        half_days=Sum('half_days'),
+    )
@@ -4,3 +4,21 @@ from django.apps import AppConfig
 class EmployeesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'employees'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        from django.conf import settings
+        if settings.SQLITE_TUNING:
+            from django.db.backends.signals import connection_created
+            from .sqlite import tune_sqlite
+
+            connection_created.connect(tune_sqlite)
+
+        if settings.METRICS_ENABLED:
+            from django.db.backends.signals import connection_created
+            from django.template.backends.django import Template
+            from .metrics import install_query_wrapper, instrument_template_render
+
+            connection_created.connect(install_query_wrapper)
+            instrument_template_render(Template)
@@ -0,0 +1,7 @@
+"""
+Reproducible performance benchmarks, run with `manage.py run_benchmarks`.
+
+dataset builds a deterministic dataset in a throwaway database, cases lists
+what is measured (every view in employees/urls.py and the payroll code
+paths) and runner times the cases and compares them with a baseline.
+"""
@@ -0,0 +1,150 @@
+import csv
+import io
+from calendar import monthrange
+from datetime import date
+
+from django.urls import resolve, reverse
+
+from .. import urls
+from ..imports import import_attendance_csv
+from ..models import Employee, Salary, Notification, Job
+from ..notify import broadcast
+from ..payroll import attendance_counts, run_payroll, pay_salaries
+from ..summaries import rebuild_summaries
+from .dataset import DATASET_END, ADMIN_USERNAME, EMPLOYEE_USERNAME
+
+
+class Case:
+    """
+    One measured operation.
+
+    View cases request `url` with the test client as `user` (None for an
+    anonymous visitor); with fresh_session the client logs in again before
+    each run, for views that end the session. Code cases call `func`.
+    """
+
+    def __init__(self, name, url=None, user=ADMIN_USERNAME, method='get', data=None,
+                 fresh_session=False, func=None):
+        self.name = name
+        self.url = url
+        self.user = user
+        self.method = method
+        self.data = data
+        self.fresh_session = fresh_session
+        self.func = func
+
+
+def dataset_ids():
+    """Primary keys of representative rows, looked up once the dataset exists"""
+    year, month = DATASET_END
+    employee = Employee.objects.get(user__username=EMPLOYEE_USERNAME)
+    return {
+        'year': year,
+        'month': month,
+        'employee': employee.pk,
+        'paid_salary': Salary.objects.filter(employee=employee, is_paid=True).order_by('-year', '-month')[0].pk,
+        'unpaid_salary': Salary.objects.filter(employee=employee, is_paid=False).order_by('-year', '-month')[0].pk,
+        'notification': Notification.objects.filter(employee=employee).order_by('-pk')[0].pk,
+        'job': Job.objects.order_by('pk')[0].pk,
+    }
+
+
+def view_cases(ids):
+    """A case for every URL in employees/urls.py (see uncovered_url_names())"""
+    year, month = ids['year'], ids['month']
+    employee, paid, unpaid = ids['employee'], ids['paid_salary'], ids['unpaid_salary']
+    job = ids['job']
+    return [
+        Case('home', reverse('home'), user=None),
+        Case('register', reverse('register'), user=None),
+        Case('login', reverse('login'), user=None),
+        Case('logout', reverse('logout'), method='post', fresh_session=True),
+
+        Case('dashboard (admin)', reverse('dashboard')),
+        Case('dashboard (employee)', reverse('dashboard'), user=EMPLOYEE_USERNAME),
+
+        Case('employee_list', reverse('employee_list')),
+        Case('employee_list (search)', reverse('employee_list') + '?search=Sharma'),
+        Case('employee_create', reverse('employee_create')),
+        Case('employee_search', reverse('employee_search') + '?q=Pat'),
+        Case('employee_detail', reverse('employee_detail', args=[employee])),
+        Case('employee_edit', reverse('employee_edit', args=[employee])),
+        Case('employee_delete', reverse('employee_delete', args=[employee])),
+
+        Case('attendance_list', reverse('attendance_list')),
+        Case('attendance_create', reverse('attendance_create')),
+        Case('attendance_import', reverse('attendance_import')),
+
+        Case('salary_list', reverse('salary_list')),
+        Case('salary_create', reverse('salary_create')),
+        Case('payroll_run', reverse('payroll_run')),
+        Case('salary_detail', reverse('salary_detail', args=[paid])),
+        Case('salary_payslip', reverse('salary_payslip', args=[paid])),
+        Case('salary_calculate', reverse('salary_calculate', args=[unpaid])),
+
+        Case('payment_bulk', reverse('payment_bulk') + f'?month={month}&year={year}'),
+        Case('payment_process', reverse('payment_process', args=[unpaid])),
+        Case('payment_mark_unpaid', reverse('payment_mark_unpaid', args=[paid])),
+
+        Case('transaction_history', reverse('transaction_history')),
+        Case('transaction_history_employee', reverse('transaction_history_employee', args=[employee])),
+
+        Case('reports (monthly)', reverse('reports') + f'?type=monthly&month={month}&year={year}'),
+        Case('reports (annual)', reverse('reports') + f'?type=annual&year={year}'),
+        Case('reports (monthly csv)', reverse('reports') + f'?type=monthly&month={month}&year={year}&format=csv'),
+        Case('reports (annual xlsx)', reverse('reports') + f'?type=annual&year={year}&format=xlsx'),
+
+        Case('job_list', reverse('job_list')),
+        Case('job_detail', reverse('job_detail', args=[job])),
+        Case('job_status', reverse('job_status', args=[job])),
+        Case('job_download', reverse('job_download', args=[job])),
+
+        Case('notifications (admin)', reverse('notifications')),
+        Case('notifications (employee)', reverse('notifications'), user=EMPLOYEE_USERNAME),
+        Case('notification_mark_read', reverse('notification_mark_read', args=[ids['notification']]),
+             user=EMPLOYEE_USERNAME),
+        Case('notification_mark_all_read', reverse('notification_mark_all_read'), user=EMPLOYEE_USERNAME,
+             method='post'),
+        Case('notification_stream', reverse('notification_stream'), user=EMPLOYEE_USERNAME),
+        Case('notification_broadcast', reverse('notification_broadcast')),
+
+        Case('metrics', reverse('metrics')),
+    ]
+
+
+def _attendance_csv(year, month):
+    """One month of attendance for every employee, as import_attendance_csv() reads it"""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(['employee_id', 'date', 'status'])
+    for employee_id in Employee.objects.order_by('pk').values_list('employee_id', flat=True):
+        for day in range(1, monthrange(year, month)[1] + 1):
+            if date(year, month, day).weekday() < 5:
+                writer.writerow([employee_id, date(year, month, day).isoformat(), 'present'])
+    return out.getvalue().splitlines(keepends=True)
+
+
+def code_cases(ids):
+    """The payroll code paths views and commands hand their work to"""
+    year, month = ids['year'], ids['month']
+    lines = _attendance_csv(year, month)
+
+    def unpaid_ids():
+        return list(Salary.objects.filter(year=year, month=month, is_paid=False).values_list('pk', flat=True))
+
+    return [
+        Case('attendance_counts', func=lambda: attendance_counts(year, month)),
+        Case('run_payroll', func=lambda: run_payroll(month, year, restart=True)),
+        Case('pay_salaries', func=lambda: pay_salaries(unpaid_ids(), date(year, month, 28), 'bank_transfer')),
+        Case('broadcast', func=lambda: broadcast(
+            Employee.objects.filter(is_active=True), 'salary_pending', 'Salary Pending', 'Benchmark broadcast',
+        )),
+        Case('import_attendance_csv', func=lambda: import_attendance_csv(iter(lines))),
+        Case('rebuild_summaries', func=lambda: rebuild_summaries(year)),
+    ]
+
+
+def uncovered_url_names(cases):
+    """Names in employees/urls.py that no view case requests"""
+    requested = {resolve(case.url.split('?')[0]).url_name for case in cases if case.url}
+    return sorted({pattern.name for pattern in urls.urlpatterns} - requested)
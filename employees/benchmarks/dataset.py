@@ -0,0 +1,141 @@
+import random
+from calendar import monthrange
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+
+from ..analytics import shift_month
+from ..models import User, Employee, Attendance, Salary, Notification, Job
+from ..payroll import run_payroll, pay_salaries
+from ..search import rebuild_search_index
+from ..seeding import ATTENDANCE_WEIGHTS, DEPARTMENTS, DESIGNATIONS, FIRST_NAMES, LAST_NAMES
+from ..summaries import rebuild_summaries
+
+
+# The dataset always ends with this month, so its rows (and the queries the
+# benchmarks run against them) are identical from run to run.
+DATASET_END = (2025, 12)
+
+# The last months are left unpaid so pending views and bulk payment have work
+UNPAID_MONTHS = 2
+
+ADMIN_USERNAME = 'bench-admin'
+EMPLOYEE_USERNAME = 'bench-employee'
+PASSWORD = 'bench-password'
+
+BATCH_SIZE = 2000
+
+
+def dataset_months(years):
+    """(year, month) pairs covered by the dataset, oldest first"""
+    return [shift_month(*DATASET_END, -offset) for offset in reversed(range(years * 12))]
+
+
+def _workdays(year, month):
+    for day in range(1, monthrange(year, month)[1] + 1):
+        current = date(year, month, day)
+        if current.weekday() < 5:
+            yield current
+
+
+def build_dataset(employees=200, years=2, seed=1, log=None):
+    """
+    Fill an empty database with a deterministic dataset.
+
+    Creates an admin and an employee login, `employees` employees with
+    `years` years of weekday attendance, a salary per employee and month
+    (calculated by run_payroll), and payments, transactions and
+    notifications for every month but the last UNPAID_MONTHS. Returns the
+    row counts.
+    """
+    rng = random.Random(seed)
+    log = log or (lambda message: None)
+    months = dataset_months(years)
+    statuses, weights = zip(*ATTENDANCE_WEIGHTS)
+
+    admin = User.objects.create_user(ADMIN_USERNAME, f'{ADMIN_USERNAME}@example.com', PASSWORD, role='admin')
+    employee_user = User.objects.create_user(EMPLOYEE_USERNAME, f'{EMPLOYEE_USERNAME}@example.com', PASSWORD)
+
+    first_year, first_month = months[0]
+    Employee.objects.bulk_create([
+        Employee(
+            user=employee_user if number == 1 else None,
+            employee_id=f'EMP{number:06d}',
+            full_name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {number}',
+            email=f'employee{number}@example.com',
+            phone=f'9{number:09d}',
+            address=f'{number} Bench Street',
+            date_of_joining=date(first_year, first_month, 1) - timedelta(days=rng.randrange(1, 1500)),
+            designation=rng.choice(DESIGNATIONS),
+            department=rng.choice(DEPARTMENTS),
+            bank_name='Bench Bank',
+            account_number=f'{number:012d}',
+            ifsc_code='BNCH0000001',
+            base_salary=Decimal(rng.randrange(250, 1500) * 100),
+            is_active=rng.random() > 0.03,
+        )
+        for number in range(1, employees + 1)
+    ], batch_size=BATCH_SIZE)
+    employee_pks = list(Employee.objects.order_by('pk').values_list('pk', flat=True))
+    log(f"{len(employee_pks)} employees")
+
+    attendance = 0
+    batch = []
+    for year, month in months:
+        days = list(_workdays(year, month))
+        for employee_pk in employee_pks:
+            for day, status in zip(days, rng.choices(statuses, weights, k=len(days))):
+                batch.append(Attendance(
+                    employee_id=employee_pk,
+                    date=day,
+                    status=status,
+                    check_in=time(9, rng.randrange(0, 30)) if status != 'absent' else None,
+                    check_out=time(17, rng.randrange(30, 60)) if status == 'present' else None,
+                ))
+                if len(batch) >= BATCH_SIZE:
+                    Attendance.objects.bulk_create(batch)
+                    attendance += len(batch)
+                    batch = []
+    Attendance.objects.bulk_create(batch)
+    attendance += len(batch)
+    log(f"{attendance} attendance rows")
+
+    # bulk_create skips the signals that keep these in step
+    rebuild_summaries()
+    rebuild_search_index()
+
+    for year, month in months:
+        run_payroll(month, year, user=admin)
+    log(f"{Salary.objects.count()} salaries")
+
+    for year, month in months[:-UNPAID_MONTHS]:
+        with transaction.atomic():
+            salary_ids = list(Salary.objects.filter(year=year, month=month).values_list('pk', flat=True))
+            pay_salaries(
+                salary_ids,
+                date(year, month, monthrange(year, month)[1]),
+                rng.choice(['bank_transfer', 'upi']),
+                transaction_prefix=f'BENCH-{year}{month:02d}',
+                user=admin,
+            )
+            # Older notifications have been read
+            Notification.objects.filter(is_read=False).update(is_read=True)
+    log(f"{Notification.objects.count()} notifications")
+
+    Job.objects.create(
+        name='payroll.run',
+        payload={'month': months[-1][1], 'year': months[-1][0]},
+        status='succeeded',
+        progress=len(employee_pks),
+        total=len(employee_pks),
+        result={'employees_processed': len(employee_pks)},
+        created_by=admin,
+    )
+
+    return {
+        'employees': len(employee_pks),
+        'attendance': attendance,
+        'salaries': Salary.objects.count(),
+        'notifications': Notification.objects.count(),
+    }
@@ -0,0 +1,167 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import django
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ..models import User
+
+
+@contextmanager
+def rolled_back():
+    """Undo whatever a case writes, so every run sees the same dataset"""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+class Clients:
+    """Logged-in test clients, one per user"""
+
+    def __init__(self):
+        self._clients = {}
+
+    def get(self, username, fresh=False):
+        if fresh or username not in self._clients:
+            client = Client()
+            if username is not None:
+                client.force_login(User.objects.get(username=username))
+            if fresh:
+                return client
+            self._clients[username] = client
+        return self._clients[username]
+
+
+def _client(case, clients):
+    # Logged in outside the rolled back run, or the session would not survive it
+    return clients.get(case.user) if case.url else None
+
+
+def _call(case, client):
+    if case.func is not None:
+        case.func()
+        return None
+    response = getattr(client, case.method)(case.url, case.data or {})
+    if response.streaming:
+        # Exports are produced while they are read
+        for _ in response.streaming_content:
+            pass
+    return response.status_code
+
+
+def measure(case, clients, repeat=5, warmup=1):
+    """
+    Time one case `repeat` times after `warmup` untimed runs.
+
+    Each run starts with an empty cache and is rolled back afterwards. Peak
+    memory is taken from one more run under tracemalloc, which would skew
+    the timings if they were taken together. Returns the case's result
+    dict; a case that raises is recorded with its error instead.
+    """
+    timings = []
+    queries = []
+    status = None
+    try:
+        for run in range(warmup + repeat):
+            cache.clear()
+            client = _client(case, clients)
+            with rolled_back():
+                if case.fresh_session:
+                    client = clients.get(case.user, fresh=True)
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    status = _call(case, client)
+                    elapsed = time.perf_counter() - started
+            if run >= warmup:
+                timings.append(elapsed * 1000)
+                queries.append(len(captured))
+
+        cache.clear()
+        client = _client(case, clients)
+        with rolled_back():
+            if case.fresh_session:
+                client = clients.get(case.user, fresh=True)
+            tracemalloc.start()
+            try:
+                _call(case, client)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    except Exception as exc:
+        return {'error': f'{type(exc).__name__}: {exc}'}
+
+    return {
+        'status': status,
+        'wall_ms': round(statistics.median(timings), 3),
+        'min_ms': round(min(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'queries': max(queries),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def run_cases(cases, repeat=5, warmup=1, progress=None):
+    clients = Clients()
+    results = {}
+    for case in cases:
+        results[case.name] = measure(case, clients, repeat, warmup)
+        if progress:
+            progress(case.name, results[case.name])
+    return results
+
+
+def environment():
+    return {
+        'created_at': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'machine': platform.machine(),
+    }
+
+
+def save_results(path, meta, results):
+    with open(path, 'w') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+# Wall time growth below this is timer noise, whatever the percentage
+MIN_REGRESSION_MS = 1.0
+
+
+def compare(results, baseline, threshold):
+    """
+    Regressions of results against baseline results.
+
+    Wall time and peak memory regress when they grow by more than
+    `threshold` (0.25 = 25%), and wall time also by at least
+    MIN_REGRESSION_MS. Query counts do not depend on the machine, so any
+    increase is a regression. Returns (case, metric, baseline, current)
+    tuples.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base or 'error' in base or 'error' in current:
+            continue
+        if current['wall_ms'] > max(base['wall_ms'] * (1 + threshold), base['wall_ms'] + MIN_REGRESSION_MS):
+            regressions.append((name, 'wall_ms', base['wall_ms'], current['wall_ms']))
+        if current['peak_kib'] > base['peak_kib'] * (1 + threshold):
+            regressions.append((name, 'peak_kib', base['peak_kib'], current['peak_kib']))
+        if current['queries'] > base['queries']:
+            regressions.append((name, 'queries', base['queries'], current['queries']))
+    return regressions
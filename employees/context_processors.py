@@ -0,0 +1,16 @@
+from django.conf import settings
+
+from .notify import unread_count
+
+
+def notifications(request):
+    """Unread notification count for the navbar badge, from the cache"""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated or user.is_admin_user():
+        return {}
+    return {'unread_notification_count': unread_count(user.pk)}
+
+
+def fragment_cache(request):
+    """Timeout for the {% cache %} fragments of base.html and the dashboard"""
+    return {'fragment_cache_timeout': settings.FRAGMENT_CACHE_TIMEOUT}
@@ -0,0 +1,114 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .aio import gather_queries, run_in_thread
+from .analytics import monthly_total_rows, salary_totals, shape_monthly_totals, shift_month
+from .models import Employee, Payment
+from .routers import use_replica
+
+
+ADMIN_DASHBOARD_CACHE_KEY = 'dashboard:admin'
+DASHBOARD_VERSION_CACHE_KEY = 'dashboard:version'
+
+
+def active_employee_count():
+    return Employee.objects.filter(is_active=True).count()
+
+
+def recent_payment_values(limit=10):
+    # Plain values so they can be cached
+    return list(
+        Payment.objects.values(
+            'payment_date',
+            employee_name=F('salary__employee__full_name'),
+            net_salary=F('salary__net_salary'),
+        )[:limit]
+    )
+
+
+def chart_period(now):
+    """Last 6 months, the last of which is the current month"""
+    return shift_month(now.year, now.month, -5), (now.year, now.month)
+
+
+def dashboard_figures(now, total_employees, totals, recent_payments, month_rows):
+    total_salaries, unpaid_salaries = totals
+    months = shape_monthly_totals(month_rows, *chart_period(now))
+
+    return {
+        'total_employees': total_employees,
+        'total_salaries': total_salaries,
+        'unpaid_salaries': unpaid_salaries,
+        'monthly_paid': months[-1]['paid'],
+        'recent_payments': recent_payments,
+        'months_data': [month['label'] for month in months],
+        'salary_data': [float(month['paid']) for month in months],
+        'computed_at': now,
+    }
+
+
+def compute_admin_dashboard():
+    now = timezone.now()
+    with use_replica():
+        return dashboard_figures(
+            now,
+            active_employee_count(),
+            salary_totals(),
+            recent_payment_values(),
+            monthly_total_rows(*chart_period(now)),
+        )
+
+
+async def acompute_admin_dashboard():
+    """compute_admin_dashboard() with its independent queries running concurrently"""
+    now = timezone.now()
+    start, end = chart_period(now)
+    with use_replica():
+        total_employees, totals, recent_payments, month_rows = await gather_queries(
+            active_employee_count,
+            salary_totals,
+            recent_payment_values,
+            lambda: monthly_total_rows(start, end),
+        )
+    return await run_in_thread(dashboard_figures, now, total_employees, totals, recent_payments, month_rows)
+
+
+def admin_dashboard_stats():
+    """Admin dashboard figures, served from the cache until salaries or payments change"""
+    return cache.get_or_set(
+        ADMIN_DASHBOARD_CACHE_KEY,
+        compute_admin_dashboard,
+        settings.DASHBOARD_CACHE_TIMEOUT,
+    )
+
+
+async def aadmin_dashboard_stats():
+    stats = await cache.aget(ADMIN_DASHBOARD_CACHE_KEY)
+    if stats is None:
+        stats = await acompute_admin_dashboard()
+        await cache.aset(ADMIN_DASHBOARD_CACHE_KEY, stats, settings.DASHBOARD_CACHE_TIMEOUT)
+    return stats
+
+
+def dashboard_version():
+    """
+    Token that changes whenever the dashboard is invalidated; part of the
+    cache key of employees' dashboard fragments. It also expires with the
+    admin figures, as an invalidation made in another process never reaches
+    an in-process cache.
+    """
+    return cache.get_or_set(DASHBOARD_VERSION_CACHE_KEY, time.time_ns, settings.DASHBOARD_CACHE_TIMEOUT)
+
+
+async def adashboard_version():
+    return await cache.aget_or_set(DASHBOARD_VERSION_CACHE_KEY, time.time_ns, settings.DASHBOARD_CACHE_TIMEOUT)
+
+
+def invalidate_dashboard():
+    # Deferred to commit so a concurrent request cannot re-cache pre-commit figures
+    transaction.on_commit(lambda: cache.delete_many([ADMIN_DASHBOARD_CACHE_KEY, DASHBOARD_VERSION_CACHE_KEY]))
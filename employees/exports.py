@@ -0,0 +1,192 @@
+import csv
+import re
+import zipfile
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.db import router
+from django.http import StreamingHttpResponse
+
+from .models import Salary
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+REPORT_COLUMNS = [
+    ('employee__employee_id', 'Employee ID'),
+    ('employee__full_name', 'Employee'),
+    ('employee__department', 'Department'),
+    ('month', 'Month'),
+    ('year', 'Year'),
+    ('base_salary', 'Base Salary'),
+    ('days_present', 'Days Present'),
+    ('days_absent', 'Days Absent'),
+    ('days_on_leave', 'Days on Leave'),
+    ('half_days', 'Half Days'),
+    ('allowances', 'Allowances'),
+    ('deductions', 'Deductions'),
+    ('net_salary', 'Net Salary'),
+    ('is_paid', 'Status'),
+]
+
+
+def report_rows(salaries):
+    """Report rows as plain tuples, employee columns joined in SQL and fetched in chunks"""
+    rows = salaries.order_by('year', 'month', 'employee__full_name', 'pk').values_list(
+        *[field for field, _ in REPORT_COLUMNS]
+    )
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield row[:-1] + ('Paid' if row[-1] else 'Pending',)
+
+
+def report_salaries(report_type, year, month=None):
+    """The salaries shown by the monthly or annual report"""
+    # Streamed exports are read after the view has returned; pick the database now
+    salaries = Salary.objects.using(router.db_for_read(Salary))
+    if report_type == 'monthly':
+        return salaries.filter(month=month, year=year)
+    return salaries.filter(year=year, is_paid=True)
+
+
+# CSV
+class _Echo:
+    """File-like object whose write() hands the formatted line back"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(header, rows):
+    writer = csv.writer(_Echo())
+    # The header goes out before the query runs
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+# XLSX
+class _ZipBuffer:
+    """Write-only, non-seekable sink that zipfile streams into"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Report" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+XLSX_SHEET_END = '</sheetData></worksheet>'
+
+# Control characters are not allowed in XML 1.0
+_XML_ILLEGAL = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _xlsx_cell(value):
+    if value is None:
+        # Cells carry no column reference, so an empty one still takes its place
+        return '<c/>'
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    text = escape(_XML_ILLEGAL.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values):
+    return '<row>' + ''.join(_xlsx_cell(value) for value in values) + '</row>'
+
+
+def stream_xlsx(header, rows, flush_every=500):
+    """Yield a single-sheet XLSX workbook piece by piece as rows are produced"""
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', XLSX_CONTENT_TYPES)
+        archive.writestr('_rels/.rels', XLSX_ROOT_RELS)
+        archive.writestr('xl/workbook.xml', XLSX_WORKBOOK)
+        archive.writestr('xl/_rels/workbook.xml.rels', XLSX_WORKBOOK_RELS)
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write((XLSX_SHEET_START + _xlsx_row(header)).encode())
+            yield buffer.pop()
+            for count, row in enumerate(rows, 1):
+                sheet.write(_xlsx_row(row).encode())
+                if count % flush_every == 0:
+                    yield buffer.pop()
+            sheet.write(XLSX_SHEET_END.encode())
+    yield buffer.pop()
+
+
+def export_response(export_format, filename, header, rows):
+    if export_format == 'xlsx':
+        response = StreamingHttpResponse(
+            stream_xlsx(header, rows),
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+        filename = f'{filename}.xlsx'
+    else:
+        response = StreamingHttpResponse(stream_csv(header, rows), content_type='text/csv')
+        filename = f'{filename}.csv'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def report_filename(report_type, year, month=None):
+    if report_type == 'monthly':
+        return f'salary-report-{year}-{month:02d}'
+    return f'salary-report-{year}'
+
+
+def report_export_response(export_format, report_type, year, month=None):
+    salaries = report_salaries(report_type, year, month)
+    header = [label for _, label in REPORT_COLUMNS]
+    return export_response(export_format, report_filename(report_type, year, month), header, report_rows(salaries))
@@ -1,7 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.db import models
-from .models import User, Employee, Attendance, Salary, Payment
+from .models import User, Employee, Attendance, Salary, Payment, Notification
 
 
 class UserRegistrationForm(UserCreationForm):
@@ -84,3 +84,52 @@ class PaymentForm(forms.ModelForm):
             'notes': forms.Textarea(attrs={'rows': 3}),
         }
 
+
+
+class PayrollRunForm(forms.Form):
+    month = forms.IntegerField(min_value=1, max_value=12)
+    year = forms.IntegerField(min_value=2000, max_value=2100)
+    restart = forms.BooleanField(
+        required=False,
+        help_text="Start a fresh run instead of resuming an interrupted one"
+    )
+    background = forms.BooleanField(
+        required=False,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+        help_text="Queue for the background worker and follow its progress"
+    )
+
+
+class BulkPaymentForm(forms.Form):
+    month = forms.IntegerField(min_value=1, max_value=12)
+    year = forms.IntegerField(min_value=2000, max_value=2100)
+    payment_date = forms.DateField(widget=forms.DateInput(attrs={'type': 'date'}))
+    payment_method = forms.ChoiceField(choices=Payment.PAYMENT_METHOD_CHOICES)
+    transaction_prefix = forms.CharField(
+        max_length=50,
+        required=False,
+        help_text="Each payment gets the transaction ID <prefix>-<salary id>"
+    )
+    notes = forms.CharField(required=False, widget=forms.Textarea(attrs={'rows': 2}))
+    background = forms.BooleanField(
+        required=False,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+        help_text="Queue for the background worker and follow its progress"
+    )
+
+
+class AttendanceImportForm(forms.Form):
+    file = forms.FileField(
+        help_text="CSV with the columns employee_id, date, status, check_in, check_out, notes"
+    )
+
+
+class NotificationBroadcastForm(forms.Form):
+    notification_type = forms.ChoiceField(choices=Notification.NOTIFICATION_TYPES)
+    title = forms.CharField(max_length=200)
+    message = forms.CharField(widget=forms.Textarea(attrs={'rows': 3}))
+    department = forms.CharField(
+        max_length=100,
+        required=False,
+        help_text="Leave empty to notify every active employee"
+    )
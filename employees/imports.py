@@ -0,0 +1,128 @@
+import csv
+import time
+from datetime import date, time as dt_time
+
+from django.db import transaction
+
+from .models import Employee, Attendance
+from .summaries import refresh_summaries
+
+
+ATTENDANCE_IMPORT_BATCH_SIZE = 1000
+ATTENDANCE_IMPORT_COLUMNS = ['employee_id', 'date', 'status', 'check_in', 'check_out', 'notes']
+
+# Only the first rejections are kept for the report; the count is always exact.
+MAX_REPORTED_REJECTIONS = 1000
+
+ATTENDANCE_STATUSES = {value for value, _ in Attendance._meta.get_field('status').choices}
+
+
+class ImportResult:
+    def __init__(self):
+        self.rows_read = 0
+        self.imported = 0
+        self.rejected_count = 0
+        self.rejected = []  # (line number, reason)
+        self.elapsed = 0.0
+
+    def reject(self, line_number, reason):
+        self.rejected_count += 1
+        if len(self.rejected) < MAX_REPORTED_REJECTIONS:
+            self.rejected.append((line_number, reason))
+
+    @property
+    def rows_per_second(self):
+        return self.rows_read / self.elapsed if self.elapsed else 0.0
+
+
+def _parse_row(row, employee_pks):
+    employee_pk = employee_pks.get((row.get('employee_id') or '').strip())
+    if employee_pk is None:
+        raise ValueError(f"Unknown employee_id '{row.get('employee_id')}'")
+
+    try:
+        attendance_date = date.fromisoformat((row.get('date') or '').strip())
+    except ValueError:
+        raise ValueError(f"Invalid date '{row.get('date')}'")
+
+    status = (row.get('status') or '').strip().lower()
+    if status not in ATTENDANCE_STATUSES:
+        raise ValueError(f"Invalid status '{row.get('status')}'")
+
+    times = []
+    for column in ('check_in', 'check_out'):
+        value = (row.get(column) or '').strip()
+        try:
+            times.append(dt_time.fromisoformat(value) if value else None)
+        except ValueError:
+            raise ValueError(f"Invalid {column} '{value}'")
+
+    return Attendance(
+        employee_id=employee_pk,
+        date=attendance_date,
+        status=status,
+        check_in=times[0],
+        check_out=times[1],
+        notes=(row.get('notes') or '').strip(),
+    )
+
+
+def _write_batch(batch):
+    Attendance.objects.bulk_create(
+        batch.values(),
+        update_conflicts=True,
+        unique_fields=['employee', 'date'],
+        update_fields=['status', 'check_in', 'check_out', 'notes'],
+    )
+    # Upserts bypass model signals, so recount the touched monthly summaries
+    refresh_summaries({
+        (employee_id, attendance_date.year, attendance_date.month)
+        for employee_id, attendance_date in batch
+    })
+
+
+def import_attendance_csv(lines, batch_size=ATTENDANCE_IMPORT_BATCH_SIZE):
+    """
+    Upsert attendance rows from CSV text lines.
+
+    The input is consumed lazily and written in fixed-size batches, so memory
+    stays flat regardless of file size. Existing (employee, date) rows are
+    updated in place.
+
+    The whole file is imported in one transaction: rows that fail
+    validation are rejected one by one, but a file that cannot be read
+    (UnicodeDecodeError, csv.Error) raises and leaves nothing imported.
+    """
+    result = ImportResult()
+    started = time.perf_counter()
+
+    employee_pks = dict(Employee.objects.values_list('employee_id', 'pk'))
+    reader = csv.DictReader(lines)
+    missing = [column for column in ('employee_id', 'date', 'status') if column not in (reader.fieldnames or [])]
+    if missing:
+        result.reject(1, f"Missing column(s): {', '.join(missing)}")
+        return result
+
+    with transaction.atomic():
+        # Keyed by (employee, date) so a repeated row in one batch keeps the last value
+        batch = {}
+        for row in reader:
+            result.rows_read += 1
+            try:
+                attendance = _parse_row(row, employee_pks)
+            except ValueError as e:
+                result.reject(reader.line_num, str(e))
+                continue
+
+            batch[(attendance.employee_id, attendance.date)] = attendance
+            if len(batch) >= batch_size:
+                _write_batch(batch)
+                result.imported += len(batch)
+                batch = {}
+
+        if batch:
+            _write_batch(batch)
+            result.imported += len(batch)
+
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,310 @@
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.db.models import F
+from django.utils import timezone
+
+from .exports import REPORT_COLUMNS, report_rows, report_salaries, report_filename, stream_csv, stream_xlsx
+from .models import Employee, Job
+from .payroll import pay_salaries, run_payroll
+from .routers import use_replica
+
+
+JOB_HANDLERS = {}
+
+EXPORT_DIR = 'exports'
+EXPORT_PROGRESS_EVERY = 5000
+
+
+def job_handler(name):
+    """
+    Register a function as the handler for jobs called name.
+
+    The handler is called as handler(job, **job.payload) on a worker and its
+    return value (JSON-serialisable) is stored as the job result.
+    """
+    def register(func):
+        JOB_HANDLERS[name] = func
+        return func
+    return register
+
+
+def enqueue(name, payload=None, user=None, max_attempts=None):
+    """Queue a job for the worker and return it right away"""
+    if name not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job {name!r}")
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        created_by=user,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
+
+
+def report_progress(job, progress, total=None, message=None):
+    """Record progress; this also serves as the job's heartbeat"""
+    job.progress = progress
+    fields = {'progress': progress, 'updated_at': timezone.now()}
+    if total is not None:
+        job.total = fields['total'] = total
+    if message is not None:
+        job.message = fields['message'] = message[:255]
+    Job.objects.filter(pk=job.pk).update(**fields)
+
+
+def claim_job(worker_id):
+    """Take the next due job for this worker, or return None"""
+    now = timezone.now()
+    candidates = (
+        Job.objects.filter(status='queued', run_after__lte=now)
+        .order_by('run_after', 'pk')
+        .values_list('pk', flat=True)[:10]
+    )
+    for pk in candidates:
+        # Only one worker can win the queued -> running transition
+        claimed = Job.objects.filter(pk=pk, status='queued').update(
+            status='running',
+            locked_by=worker_id,
+            attempts=F('attempts') + 1,
+            started_at=now,
+            updated_at=now,
+        )
+        if claimed:
+            return pk
+    return None
+
+
+def requeue_stale_jobs():
+    """Give jobs whose worker stopped sending progress back to the queue"""
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status='running',
+        updated_at__lt=now - timedelta(seconds=settings.JOB_STALE_TIMEOUT),
+    )
+    requeued = stale.filter(attempts__lt=F('max_attempts')).update(
+        status='queued', locked_by='', run_after=now, updated_at=now,
+        message='Worker stopped responding; requeued',
+    )
+    failed = stale.update(
+        status='failed', finished_at=now, updated_at=now,
+        message='Worker stopped responding',
+    )
+    return requeued + failed
+
+
+def _claimed(job, worker_id):
+    """
+    The job, as long as this worker still holds it. A job requeued as stale
+    and claimed by another worker must not be overwritten when the first
+    one finishes late.
+    """
+    return Job.objects.filter(pk=job.pk, status='running', locked_by=worker_id)
+
+
+def _retry_or_fail(job, error, worker_id):
+    now = timezone.now()
+    if job.attempts < job.max_attempts:
+        delay = settings.JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+        return _claimed(job, worker_id).update(
+            status='queued',
+            locked_by='',
+            run_after=now + timedelta(seconds=delay),
+            error=error,
+            message=f"Attempt {job.attempts} of {job.max_attempts} failed; retrying in {delay}s",
+            updated_at=now,
+        )
+    return _claimed(job, worker_id).update(
+        status='failed',
+        error=error,
+        message=f"Failed after {job.attempts} attempts",
+        finished_at=now,
+        updated_at=now,
+    )
+
+
+def execute_job(job_id, worker_id):
+    """
+    Run a job claimed by worker_id and record its outcome: True if it
+    succeeded, False if it failed, None if the worker lost its claim on
+    the job meanwhile (the outcome is then discarded).
+    """
+    close_old_connections()
+    try:
+        job = Job.objects.select_related('created_by').get(pk=job_id)
+        try:
+            handler = JOB_HANDLERS.get(job.name)
+            if handler is None:
+                raise LookupError(f"No handler registered for job {job.name!r}")
+            result = handler(job, **job.payload)
+        except Exception:
+            return False if _retry_or_fail(job, traceback.format_exc(), worker_id) else None
+
+        now = timezone.now()
+        finished = _claimed(job, worker_id).update(
+            status='succeeded',
+            result=result,
+            error='',
+            message='Done',
+            finished_at=now,
+            updated_at=now,
+        )
+        return True if finished else None
+    finally:
+        close_old_connections()
+
+
+def _release_job(job_id, worker_id, error):
+    """Retry or fail a job whose run ended in an error outside its handler"""
+    close_old_connections()
+    try:
+        _retry_or_fail(Job.objects.get(pk=job_id), error, worker_id)
+    finally:
+        close_old_connections()
+
+
+def run_worker(workers=None, mode='thread', poll_interval=1.0, burst=False, log=None):
+    """
+    Claim queued jobs and run them on a thread or process pool.
+
+    Runs until interrupted, or with burst=True until no job is due.
+    Processes are spawned, not forked, so they never share the parent's
+    database connections.
+    """
+    workers = workers or settings.JOB_WORKERS
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"[:100]
+    log = log or (lambda message: None)
+
+    def start_pool():
+        if mode == 'process':
+            return ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=django.setup,
+            )
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+
+    pool = start_pool()
+    running = {}
+    try:
+        while True:
+            requeue_stale_jobs()
+
+            while len(running) < workers:
+                job_id = claim_job(worker_id)
+                if job_id is None:
+                    break
+                log(f"Started job {job_id}")
+                running[pool.submit(execute_job, job_id, worker_id)] = job_id
+
+            if not running:
+                if burst:
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                job_id = running.pop(future)
+                try:
+                    outcome = future.result()
+                except Exception as exc:
+                    # e.g. the job was deleted, the database went away, or a
+                    # process of the pool died; the worker itself keeps going
+                    broken = broken or isinstance(exc, BrokenExecutor)
+                    log(f"Job {job_id} errored outside its handler: {type(exc).__name__}: {exc}")
+                    try:
+                        _release_job(job_id, worker_id, traceback.format_exc())
+                    except Exception as release_exc:
+                        log(f"Could not requeue job {job_id}: {type(release_exc).__name__}: {release_exc}")
+                    continue
+                if outcome is None:
+                    log(f"Job {job_id} finished after it was requeued; its outcome was discarded")
+                else:
+                    log(f"Job {job_id} {'succeeded' if outcome else 'failed'}")
+
+            if broken:
+                # A broken pool fails every job still on it; those are released as they come back
+                log("Worker pool broke; starting a new one")
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = start_pool()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+# Handlers
+@job_handler('payroll.run')
+def payroll_run_job(job, month, year, restart=False):
+    total = Employee.objects.filter(is_active=True).count()
+    report_progress(job, 0, total, 'Starting payroll')
+
+    def progress(run):
+        report_progress(job, run.employees_processed, total, f"{run.employees_processed} of {total} employees processed")
+
+    # A retry resumes from the checkpoint instead of starting over again
+    run = run_payroll(month, year, user=job.created_by, restart=restart and job.attempts == 1, progress=progress)
+    return {
+        'payroll_run': run.pk,
+        'status': run.status,
+        'created': run.salaries_created,
+        'updated': run.salaries_updated,
+        'skipped': run.salaries_skipped,
+    }
+
+
+@job_handler('payments.bulk')
+def bulk_payment_job(job, salary_ids, payment_date, payment_method, transaction_prefix='', notes=''):
+    report_progress(job, 0, len(salary_ids), f"Paying {len(salary_ids)} salaries")
+    results = pay_salaries(
+        salary_ids,
+        date.fromisoformat(payment_date),
+        payment_method,
+        transaction_prefix=transaction_prefix,
+        notes=notes,
+        user=job.created_by,
+    )
+    paid = sum(1 for result in results if result['success'])
+    report_progress(job, len(results), message=f"{paid} of {len(results)} salaries paid")
+    return {
+        'paid': paid,
+        'failed': [
+            {'salary_id': result['salary_id'], 'employee': str(result['employee'] or ''), 'message': result['message']}
+            for result in results if not result['success']
+        ],
+    }
+
+
+@job_handler('reports.export')
+def report_export_job(job, export_format, report_type, year, month=None):
+    with use_replica():
+        salaries = report_salaries(report_type, year, month)
+    total = salaries.count()
+    report_progress(job, 0, total, 'Exporting')
+
+    def counted(rows):
+        for count, row in enumerate(rows, 1):
+            if count % EXPORT_PROGRESS_EVERY == 0:
+                report_progress(job, count, message=f"{count} of {total} rows exported")
+            yield row
+
+    header = [label for _, label in REPORT_COLUMNS]
+    stream = stream_xlsx if export_format == 'xlsx' else stream_csv
+    filename = f"{report_filename(report_type, year, month)}.{export_format}"
+    path = Path(settings.PRIVATE_MEDIA_ROOT) / EXPORT_DIR / f"{job.pk}-{filename}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, 'wb') as output:
+        for chunk in stream(header, counted(report_rows(salaries))):
+            output.write(chunk.encode() if isinstance(chunk, str) else chunk)
+
+    report_progress(job, total, message=f"{total} rows exported")
+    return {'file': str(path.relative_to(settings.PRIVATE_MEDIA_ROOT)), 'filename': filename}
@@ -0,0 +1,101 @@
+import asyncio
+import statistics
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncRequestFactory, override_settings
+from django.utils import timezone
+
+from employees import views
+from employees.models import User
+
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare p50/p99 latency of the sync and async dashboard and report views "
+        "under concurrent load, calling them the way the ASGI handler does"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Requests per view and mode")
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--username', help="Admin user to request the pages as (default: first admin)")
+        parser.add_argument(
+            '--warm-cache', action='store_true',
+            help="Let the dashboard serve its cached figures instead of recomputing them each time",
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(role='admin')
+        if options['username']:
+            users = users.filter(username=options['username'])
+        user = users.first()
+        if user is None:
+            raise CommandError("No admin user to run the benchmark as")
+
+        now = timezone.now()
+        pages = [
+            ('dashboard', '/dashboard/', {}, views.dashboard, views.dashboard_async),
+            ('monthly report', '/reports/', {'type': 'monthly', 'month': now.month, 'year': now.year},
+             views.reports, views.reports_async),
+            ('annual report', '/reports/', {'type': 'annual', 'year': now.year},
+             views.reports, views.reports_async),
+        ]
+
+        self.stdout.write(
+            f"{options['requests']} requests per view and mode, {options['concurrency']} concurrent\n"
+        )
+        self.stdout.write(f"{'view':<16} {'mode':<6} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8} {'req/s':>8}")
+        for name, path, params, sync_view, async_view in pages:
+            for mode, view in (('sync', sync_view), ('async', async_view)):
+                if options['warm_cache']:
+                    latencies, elapsed = asyncio.run(self.load(
+                        view, path, params, user, options['requests'], options['concurrency'],
+                    ))
+                else:
+                    # Every request computes its figures from the database
+                    with override_settings(CACHES=NO_CACHE):
+                        latencies, elapsed = asyncio.run(self.load(
+                            view, path, params, user, options['requests'], options['concurrency'],
+                        ))
+                self.stdout.write(
+                    f"{name:<16} {mode:<6} {percentile(latencies, 50):8.2f} {percentile(latencies, 99):8.2f} "
+                    f"{statistics.fmean(latencies):8.2f} {len(latencies) / elapsed:8.1f}"
+                )
+
+    async def load(self, view, path, params, user, total, concurrency):
+        factory = AsyncRequestFactory()
+        if not asyncio.iscoroutinefunction(view):
+            # The ASGI handler runs sync views on its single thread-sensitive executor
+            view = sync_to_async(view)
+
+        async def auser():
+            return user
+
+        latencies = []
+        remaining = iter(range(total))
+
+        async def client():
+            for _ in remaining:
+                request = factory.get(path, params)
+                request.user = user
+                request.auser = auser
+                started = time.perf_counter()
+                response = await view(request)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    raise CommandError(f"{path} returned {response.status_code}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return latencies, time.perf_counter() - started
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
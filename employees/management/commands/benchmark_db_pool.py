@@ -0,0 +1,173 @@
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from employees.models import User
+from .benchmark_async_views import NO_CACHE, percentile
+
+
+MODES = {'persistent': '0', 'pooled': '1'}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load the hot views from many threads against PostgreSQL and report throughput, latency "
+        "and the peak number of backend connections, with persistent connections or the "
+        "DATABASE_POOL connection pool"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=32,
+                            help="Concurrent request threads, like a gthread worker's --threads")
+        parser.add_argument('--duration', type=float, default=10, help="Seconds of load")
+        parser.add_argument('--username', help="Admin user to request the pages as (default: first admin)")
+        parser.add_argument('--compare', action='store_true',
+                            help="Run once with persistent connections and once pooled, in fresh processes")
+        parser.add_argument('--json', action='store_true', help="Print the result as JSON")
+
+    def handle(self, *args, **options):
+        if options['compare']:
+            results = [self.run_mode(mode, options) for mode in MODES]
+        else:
+            results = [self.load(options)]
+
+        if options['json']:
+            self.stdout.write(json.dumps(results[0]))
+            return
+        self.stdout.write(
+            f"{options['threads']} threads for {options['duration']:g}s against "
+            f"{connection.settings_dict['NAME']}\n"
+        )
+        self.stdout.write(
+            f"{'mode':<11} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7} "
+            f"{'peak conns':>11}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result['mode']:<11} {result['requests']:>9} {result['throughput']:8.1f} "
+                f"{result['p50_ms']:8.2f} {result['p95_ms']:8.2f} {result['errors']:>7} "
+                f"{result['peak_connections']:>11}"
+            )
+
+    def run_mode(self, mode, options):
+        """Run the benchmark in a new process, since the pool is set up from settings at startup"""
+        command = [
+            sys.executable, str(settings.BASE_DIR / 'manage.py'), 'benchmark_db_pool', '--json',
+            '--threads', str(options['threads']), '--duration', str(options['duration']),
+        ]
+        if options['username']:
+            command += ['--username', options['username']]
+        child = subprocess.run(
+            command, env={**os.environ, 'DATABASE_POOL': MODES[mode]}, capture_output=True, text=True,
+        )
+        if child.returncode:
+            raise CommandError(f"The {mode} run failed:\n{child.stderr}")
+        return json.loads(child.stdout.splitlines()[-1])
+
+    def load(self, options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Connection pooling needs PostgreSQL; point DATABASE_URL at a local instance")
+        users = User.objects.filter(role='admin')
+        if options['username']:
+            users = users.filter(username=options['username'])
+        user = users.first()
+        if user is None:
+            raise CommandError("No admin user to run the benchmark as")
+
+        now = timezone.now()
+        urls = [
+            reverse('dashboard'),
+            reverse('employee_list'),
+            reverse('salary_list'),
+            reverse('transaction_history'),
+            f"{reverse('reports')}?type=monthly&month={now.month}&year={now.year}",
+        ]
+        login = Client()
+        login.force_login(user)
+        session_key = login.cookies[settings.SESSION_COOKIE_NAME].value
+        # Only the load threads' connections should show up
+        connections.close_all()
+
+        latencies = []
+        errors = []
+        deadline = time.perf_counter() + options['duration']
+        stop = threading.Event()
+        peak = [0]
+
+        def worker(offset):
+            client = Client()
+            client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+            try:
+                for number in itertools.count(offset):
+                    if time.perf_counter() >= deadline:
+                        break
+                    started = time.perf_counter()
+                    try:
+                        response = client.get(urls[number % len(urls)])
+                        if response.status_code != 200:
+                            errors.append(f"{response.status_code}")
+                    except Exception as exc:
+                        # e.g. PoolTimeout when no connection came free in time
+                        errors.append(type(exc).__name__)
+                    finally:
+                        # What the WSGI handler does at the end of a request; the
+                        # test client skips it
+                        close_old_connections()
+                    latencies.append((time.perf_counter() - started) * 1000)
+            finally:
+                connections.close_all()
+
+        def sampler():
+            # Connected directly, so it takes no slot in the pool. Counts backend
+            # connections to this database apart from its own; in autocommit, as
+            # pg_stat_activity is a snapshot for the length of a transaction
+            raw = connection.Database.connect(**connection.get_connection_params())
+            raw.autocommit = True
+            try:
+                cursor = raw.cursor()
+                while not stop.wait(0.05):
+                    cursor.execute(
+                        "SELECT count(*) FROM pg_stat_activity "
+                        "WHERE datname = current_database() AND pid <> pg_backend_pid()"
+                    )
+                    peak[0] = max(peak[0], cursor.fetchone()[0])
+            finally:
+                raw.close()
+
+        # Every request reads the database, as it would after an invalidation
+        with override_settings(CACHES=NO_CACHE):
+            watcher = threading.Thread(target=sampler)
+            watcher.start()
+            threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(options['threads'])]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+            stop.set()
+            watcher.join()
+
+        if not latencies:
+            raise CommandError("No requests completed")
+        return {
+            'mode': 'pooled' if settings.DATABASE_POOL else 'persistent',
+            'requests': len(latencies),
+            'throughput': len(latencies) / elapsed,
+            'p50_ms': statistics.median(latencies),
+            'p95_ms': percentile(latencies, 95),
+            'errors': len(errors),
+            'peak_connections': peak[0],
+        }
@@ -0,0 +1,172 @@
+import json
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+from django.utils import timezone
+
+from employees.analytics import attendance_totals, monthly_total_rows
+from employees.models import Attendance, Employee, Salary
+from employees.payroll import pay_salaries
+from .benchmark_async_views import percentile
+
+
+MODES = {'default': '0', 'tuned': '1'}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent attendance entry, payments and report reads against copies of the SQLite "
+        "database and count 'database is locked' errors, with SQLite's defaults and with the "
+        "SQLITE_TUNING profile"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help="Threads entering attendance and paying salaries")
+        parser.add_argument('--readers', type=int, default=2, help="Threads reading report figures")
+        parser.add_argument('--duration', type=float, default=10, help="Seconds of load")
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--json', action='store_true',
+                            help="Run once against the configured database and print the result as JSON")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("This benchmark is for SQLite databases")
+        if options['json']:
+            self.stdout.write(json.dumps(self.load(options)))
+            return
+
+        self.stdout.write(
+            f"{options['writers']} writers and {options['readers']} readers for {options['duration']:g}s "
+            f"on copies of {connection.settings_dict['NAME']}\n"
+        )
+        self.stdout.write(
+            f"{'mode':<8} {'writes':>7} {'writes/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'reads':>6} "
+            f"{'locked':>7} {'other errors':>13}"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            for mode in MODES:
+                result = self.run_mode(mode, Path(directory) / f'{mode}.sqlite3', options)
+                self.stdout.write(
+                    f"{mode:<8} {result['writes']:>7} {result['writes_per_second']:9.1f} "
+                    f"{result['p50_ms']:8.2f} {result['p95_ms']:8.2f} {result['reads']:>6} "
+                    f"{result['locked']:>7} {result['errors']:>13}"
+                )
+
+    def run_mode(self, mode, path, options):
+        """Copy the database and run the load on the copy in a new process with the mode's settings"""
+        source = sqlite3.connect(connection.settings_dict['NAME'])
+        target = sqlite3.connect(path)
+        try:
+            source.backup(target)
+            # A tuned database stays in WAL mode; start each copy from SQLite's default
+            target.execute("PRAGMA journal_mode = DELETE")
+        finally:
+            source.close()
+            target.close()
+
+        command = [
+            sys.executable, str(settings.BASE_DIR / 'manage.py'), 'benchmark_sqlite_contention', '--json',
+            '--writers', str(options['writers']), '--readers', str(options['readers']),
+            '--duration', str(options['duration']), '--seed', str(options['seed']),
+        ]
+        env = {**os.environ, 'DATABASE_URL': f'sqlite:///{path}', 'SQLITE_TUNING': MODES[mode]}
+        child = subprocess.run(command, env=env, capture_output=True, text=True)
+        if child.returncode:
+            raise CommandError(f"The {mode} run failed:\n{child.stderr}")
+        return json.loads(child.stdout.splitlines()[-1])
+
+    def load(self, options):
+        employee_ids = list(Employee.objects.filter(is_active=True).values_list('pk', flat=True))
+        if not employee_ids:
+            raise CommandError("There are no active employees to enter attendance for")
+        unpaid = iter(
+            Salary.objects.filter(is_paid=False, net_salary__gt=0).order_by('pk').values_list('pk', flat=True)
+        )
+        today = timezone.localdate()
+        connections.close_all()
+
+        lock = threading.Lock()
+        latencies = []
+        reads = [0]
+        locked = []
+        errors = []
+        deadline = time.perf_counter() + options['duration']
+
+        def next_unpaid():
+            with lock:
+                return next(unpaid, None)
+
+        def write(rng):
+            salary_id = next_unpaid() if rng.random() < 0.3 else None
+            if salary_id is not None:
+                pay_salaries([salary_id], today, 'bank_transfer', transaction_prefix='BENCH')
+            else:
+                # Like the attendance form: read the day's record, then write it
+                with transaction.atomic():
+                    Attendance.objects.update_or_create(
+                        employee_id=rng.choice(employee_ids),
+                        date=today - timedelta(days=rng.randrange(28)),
+                        defaults={'status': rng.choice(['present', 'absent', 'leave', 'half_day'])},
+                    )
+
+        def writer(number):
+            rng = random.Random(options['seed'] + number)
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        write(rng)
+                    except OperationalError as exc:
+                        (locked if 'locked' in str(exc) else errors).append(str(exc))
+                        continue
+                    except Exception as exc:
+                        errors.append(f'{type(exc).__name__}: {exc}')
+                        continue
+                    latencies.append((time.perf_counter() - started) * 1000)
+            finally:
+                connections.close_all()
+
+        def reader():
+            try:
+                while time.perf_counter() < deadline:
+                    try:
+                        # The report queries; long reads are what block writers without WAL
+                        attendance_totals(today.year, today.month)
+                        monthly_total_rows((today.year, 1), (today.year, 12))
+                        with lock:
+                            reads[0] += 1
+                    except OperationalError as exc:
+                        (locked if 'locked' in str(exc) else errors).append(str(exc))
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=writer, args=(number,)) for number in range(options['writers'])]
+        threads += [threading.Thread(target=reader) for _ in range(options['readers'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        return {
+            'writes': len(latencies),
+            'writes_per_second': len(latencies) / elapsed,
+            'p50_ms': statistics.median(latencies) if latencies else 0,
+            'p95_ms': percentile(latencies, 95) if latencies else 0,
+            'reads': reads[0],
+            'locked': len(locked),
+            'errors': len(errors),
+        }
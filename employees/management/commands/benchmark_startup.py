@@ -0,0 +1,106 @@
+import argparse
+import io
+import json
+import multiprocessing
+import statistics
+import subprocess
+import sys
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from employees.warmup import warm_up
+
+
+def first_response(application, path):
+    """Serve one GET through the WSGI application, as a worker would"""
+    environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'GET', 'wsgi.input': io.BytesIO()}
+    setup_testing_defaults(environ)
+    statuses = []
+    body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        for _ in body:
+            pass
+    finally:
+        body.close()
+    return statuses[0]
+
+
+def _forked_worker(application, path, forked_at, results):
+    status = first_response(application, path)
+    results.put((status, time.perf_counter() - forked_at))
+
+
+class Command(BaseCommand):
+    help = (
+        "Report each worker's time to first response when workers import the app themselves, when "
+        "they are forked from a preloaded master, and when the master is also warmed up"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--path', default='/login/', help="Page each worker serves first")
+        parser.add_argument('--first-request', action='store_true',
+                            help="Serve one request from this fresh process and print how long it took")
+        parser.add_argument('--started', type=float, help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['first_request']:
+            from payment_management.wsgi import application
+            status = first_response(application, options['path'])
+            self.stdout.write(json.dumps([status, time.time() - options['started']]))
+            return
+
+        self.stdout.write(f"Time to first response of {options['path']}, {options['workers']} workers\n")
+        self.report('no preload', [self.spawn(options) for _ in range(options['workers'])])
+
+        from payment_management.wsgi import application
+        self.report('preload', self.fork(application, options))
+
+        started = time.perf_counter()
+        steps = warm_up()
+        self.stdout.write(
+            f"  (warm-up in the master: {(time.perf_counter() - started) * 1000:.0f} ms; "
+            + ', '.join(f"{count} {step}" for step, (count, _) in steps.items()) + ")"
+        )
+        self.report('preload + warm-up', self.fork(application, options))
+
+    def spawn(self, options):
+        """A worker that imports and sets up the app itself, timed from process start"""
+        command = [
+            sys.executable, str(settings.BASE_DIR / 'manage.py'), 'benchmark_startup', '--first-request',
+            '--path', options['path'], '--started', repr(time.time()),
+        ]
+        child = subprocess.run(command, capture_output=True, text=True)
+        if child.returncode:
+            raise CommandError(f"The worker failed:\n{child.stderr}")
+        return tuple(json.loads(child.stdout.splitlines()[-1]))
+
+    def fork(self, application, options):
+        """Workers forked from this process, timed from the fork"""
+        # Like gunicorn's master: no connection may be shared with the children
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        workers = []
+        for _ in range(options['workers']):
+            worker = context.Process(
+                target=_forked_worker, args=(application, options['path'], time.perf_counter(), results),
+            )
+            worker.start()
+            worker.join()
+            workers.append(results.get())
+        return workers
+
+    def report(self, mode, workers):
+        for status, seconds in workers:
+            if not status.startswith('200'):
+                raise CommandError(f"{mode}: the first response was {status}")
+        timings = [seconds * 1000 for _, seconds in workers]
+        self.stdout.write(
+            f"{mode:<18} " + ' '.join(f"{ms:7.1f}" for ms in timings)
+            + f"  mean {statistics.fmean(timings):7.1f} ms"
+        )
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from employees.payslips import generate_payslips
+
+
+class Command(BaseCommand):
+    help = "Render the PDF payslips of a month in parallel, skipping slips that are already cached"
+
+    def add_arguments(self, parser):
+        now = timezone.now()
+        parser.add_argument('--month', type=int, default=now.month)
+        parser.add_argument('--year', type=int, default=now.year)
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help="Number of worker processes (default: one per CPU core)",
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help="Re-render slips even if a cached copy is up to date",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rendered, cached = generate_payslips(
+            options['month'],
+            options['year'],
+            workers=options['workers'],
+            force=options['force'],
+        )
+
+        elapsed = time.perf_counter() - started
+        rate = rendered / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Payslips {options['month']}/{options['year']}: {rendered} rendered, "
+            f"{cached} already up to date ({elapsed:.2f}s, {rate:.1f} slips/s)"
+        ))
@@ -0,0 +1,44 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employees.imports import ATTENDANCE_IMPORT_BATCH_SIZE, ATTENDANCE_IMPORT_COLUMNS, import_attendance_csv
+
+
+class Command(BaseCommand):
+    help = (
+        "Import attendance from a CSV file with the columns "
+        + ", ".join(ATTENDANCE_IMPORT_COLUMNS)
+        + ". Existing rows for the same employee and date are updated."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=ATTENDANCE_IMPORT_BATCH_SIZE)
+        parser.add_argument(
+            '--show-rejected', type=int, default=20,
+            help="Number of rejected rows to print",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            csv_file = open(options['path'], newline='', encoding='utf-8-sig')
+        except OSError as e:
+            raise CommandError(f"Cannot open {options['path']}: {e}")
+
+        with csv_file:
+            try:
+                result = import_attendance_csv(csv_file, batch_size=options['batch_size'])
+            except (UnicodeDecodeError, csv.Error) as e:
+                raise CommandError(f"Cannot read {options['path']}, nothing was imported: {e}")
+
+        for line_number, reason in result.rejected[:options['show_rejected']]:
+            self.stdout.write(self.style.WARNING(f"  line {line_number}: {reason}"))
+        if result.rejected_count > options['show_rejected']:
+            self.stdout.write(f"  ... {result.rejected_count - options['show_rejected']} more rejected rows")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {result.rows_read} rows in {result.elapsed:.2f}s "
+            f"({result.rows_per_second:,.0f} rows/s): "
+            f"{result.imported} imported, {result.rejected_count} rejected"
+        ))
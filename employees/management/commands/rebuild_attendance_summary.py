@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from employees.summaries import SUMMARY_BATCH_SIZE, rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monthly attendance summaries from raw attendance records"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help="Only rebuild this year")
+        parser.add_argument('--batch-size', type=int, default=SUMMARY_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        written = rebuild_summaries(year=options['year'], batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {written} monthly summaries in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from employees.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the employee search index (SQLite FTS5; PostgreSQL indexes need no rebuild)"
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stdout.write(f"Nothing to rebuild on {connection.vendor}")
+            return
+        rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS("Employee search index rebuilt"))
@@ -0,0 +1,94 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from employees.benchmarks.cases import code_cases, dataset_ids, uncovered_url_names, view_cases
+from employees.benchmarks.dataset import build_dataset
+from employees.benchmarks.runner import compare, environment, load_results, run_cases, save_results
+
+
+class Command(BaseCommand):
+    help = (
+        "Build a deterministic dataset in a throwaway test database, time every view and the "
+        "payroll code paths, save the results as JSON and compare them with a baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=200)
+        parser.add_argument('--years', type=int, default=2, help="Years of attendance, salaries and payments")
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--repeat', type=int, default=5, help="Timed runs per case (the median is kept)")
+        parser.add_argument('--warmup', type=int, default=1)
+        parser.add_argument('--case', action='append', default=[],
+                            help="Only run cases whose name contains this text (repeatable)")
+        parser.add_argument('--output', default=str(settings.BASE_DIR / 'benchmark-results.json'))
+        parser.add_argument('--baseline', default=str(settings.BASE_DIR / 'benchmark-baseline.json'))
+        parser.add_argument('--save-baseline', action='store_true',
+                            help="Store these results as the baseline instead of comparing with it")
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help="Allowed growth of wall time and peak memory before it counts as a regression")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, serialized_aliases=[])
+        try:
+            meta, results = self.run(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        save_results(options['output'], meta, results)
+        self.stdout.write(f"Results written to {options['output']}")
+
+        if options['save_baseline']:
+            save_results(options['baseline'], meta, results)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {options['baseline']}"))
+            return
+
+        try:
+            baseline = load_results(options['baseline'])
+        except FileNotFoundError:
+            self.stdout.write(f"No baseline at {options['baseline']}; run with --save-baseline to create one")
+            return
+        if baseline['meta'].get('dataset') != meta['dataset']:
+            self.stdout.write(self.style.WARNING("The baseline was taken with a different dataset"))
+
+        regressions = compare(results, baseline['results'], options['threshold'])
+        for name, metric, before, after in regressions:
+            self.stdout.write(self.style.ERROR(f"{name}: {metric} {before} -> {after}"))
+        if regressions:
+            raise CommandError(f"{len(regressions)} regression(s) against {options['baseline']}")
+        self.stdout.write(self.style.SUCCESS(f"No regressions beyond {options['threshold']:.0%}"))
+
+    def run(self, options):
+        dataset = {'employees': options['employees'], 'years': options['years'], 'seed': options['seed']}
+        started = time.perf_counter()
+        counts = build_dataset(**dataset, log=lambda message: self.stdout.write(f"  {message}"))
+        self.stdout.write(f"Dataset built in {time.perf_counter() - started:.1f}s\n")
+
+        ids = dataset_ids()
+        views = view_cases(ids)
+        for name in uncovered_url_names(views):
+            self.stdout.write(self.style.WARNING(f"No benchmark case for URL '{name}'"))
+
+        cases = views + code_cases(ids)
+        if options['case']:
+            cases = [case for case in cases if any(text in case.name for text in options['case'])]
+
+        self.stdout.write(f"{'case':<32} {'status':>6} {'wall ms':>9} {'queries':>8} {'peak KiB':>9}")
+        results = run_cases(cases, options['repeat'], options['warmup'], progress=self.report)
+
+        meta = environment()
+        meta.update(dataset=dataset, rows=counts, repeat=options['repeat'])
+        return meta, results
+
+    def report(self, name, result):
+        if 'error' in result:
+            self.stdout.write(self.style.ERROR(f"{name:<32} {result['error']}"))
+        else:
+            self.stdout.write(
+                f"{name:<32} {result['status'] or '':>6} {result['wall_ms']:9.2f} "
+                f"{result['queries']:8d} {result['peak_kib']:9.1f}"
+            )
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from employees.payroll import PAYROLL_CHUNK_SIZE, run_payroll
+
+
+class Command(BaseCommand):
+    help = "Create or recalculate salaries for every active employee for a month"
+
+    def add_arguments(self, parser):
+        now = timezone.now()
+        parser.add_argument('--month', type=int, default=now.month)
+        parser.add_argument('--year', type=int, default=now.year)
+        parser.add_argument('--chunk-size', type=int, default=PAYROLL_CHUNK_SIZE)
+        parser.add_argument(
+            '--restart', action='store_true',
+            help="Start a fresh run instead of resuming an interrupted one",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        def progress(run):
+            self.stdout.write(
+                f"  {run.employees_processed} employees processed "
+                f"(checkpoint: employee pk {run.last_employee_pk})"
+            )
+
+        run = run_payroll(
+            options['month'],
+            options['year'],
+            chunk_size=options['chunk_size'],
+            restart=options['restart'],
+            progress=progress,
+        )
+
+        if run.status == 'failed':
+            raise CommandError(f"Payroll run {run.pk} was superseded by a restarted run and stopped")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Payroll {run.month}/{run.year} completed in {elapsed:.2f}s: "
+            f"{run.salaries_created} created, {run.salaries_updated} recalculated, "
+            f"{run.salaries_skipped} already paid"
+        ))
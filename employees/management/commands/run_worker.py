@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from employees.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (payroll runs, bulk payments, report exports)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=settings.JOB_WORKERS,
+            help="Number of jobs to run at the same time",
+        )
+        parser.add_argument(
+            '--mode', choices=['thread', 'process'], default='thread',
+            help="Run jobs on a thread pool or on a pool of processes",
+        )
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument(
+            '--burst', action='store_true',
+            help="Exit once no job is due instead of waiting for more",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Worker started: {options['workers']} {options['mode']}(s)")
+        try:
+            run_worker(
+                workers=options['workers'],
+                mode=options['mode'],
+                poll_interval=options['poll_interval'],
+                burst=options['burst'],
+                log=self.stdout.write,
+            )
+        except KeyboardInterrupt:
+            self.stdout.write("Worker stopped")
+        else:
+            self.stdout.write(self.style.SUCCESS("No jobs left"))
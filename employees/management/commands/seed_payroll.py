@@ -0,0 +1,82 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from employees.analytics import shift_month
+from employees.models import Employee
+from employees.seeding import SEED_CHUNK_SIZE, SEED_EMPLOYEE_PREFIX, insert_method, seed_payroll
+
+
+def year_month(value):
+    try:
+        year, month = (int(part) for part in value.split('-'))
+    except ValueError:
+        raise ValueError(f"expected YYYY-MM, got {value!r}")
+    if not 1 <= month <= 12:
+        raise ValueError(f"month out of range in {value!r}")
+    return year, month
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate large amounts of linked synthetic data (employees, attendance, salaries, "
+        "payments, transactions, notifications) with a fixed seed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=1000)
+        parser.add_argument('--months', type=int, default=12, help="Months of data, ending with --end")
+        parser.add_argument('--end', type=year_month, help="Last month as YYYY-MM (default: this month)")
+        parser.add_argument('--unpaid-months', type=int, default=1,
+                            help="Number of the latest months whose salaries are left unpaid")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--chunk-size', type=int, default=SEED_CHUNK_SIZE)
+        parser.add_argument('--method', choices=['copy', 'executemany', 'bulk_create'],
+                            help="How rows are inserted (default: COPY on PostgreSQL, executemany on SQLite)")
+
+    def handle(self, *args, **options):
+        method = options['method'] or insert_method()
+        if method == 'copy' and insert_method() != 'copy':
+            raise CommandError("COPY is only available on PostgreSQL")
+        if Employee.objects.filter(employee_id__startswith=SEED_EMPLOYEE_PREFIX).exists():
+            raise CommandError(
+                f"Seeded employees ({SEED_EMPLOYEE_PREFIX}...) already exist; "
+                f"delete them before seeding again"
+            )
+
+        end = options['end']
+        if end is None:
+            today = timezone.localdate()
+            end = (today.year, today.month)
+        start = shift_month(*end, -(options['months'] - 1))
+        paid_until = shift_month(*end, -options['unpaid_months'])
+
+        self.stdout.write(
+            f"Seeding {options['employees']} employees, {start[0]}-{start[1]:02d} to {end[0]}-{end[1]:02d}, "
+            f"using {method}"
+        )
+        started = time.perf_counter()
+        writers = seed_payroll(
+            employees=options['employees'],
+            start=start,
+            end=end,
+            paid_until=paid_until,
+            seed=options['seed'],
+            chunk_size=options['chunk_size'],
+            method=method,
+            log=lambda message: self.stdout.write(f"  {message}"),
+        )
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"\n{'table':<24} {'rows':>10} {'insert s':>9} {'rows/s':>10}")
+        for writer in writers:
+            self.stdout.write(
+                f"{writer.model._meta.db_table:<24} {writer.rows:>10} {writer.seconds:9.2f} "
+                f"{writer.rows_per_second:10.0f}"
+            )
+        total = sum(writer.rows for writer in writers)
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s including generation "
+            f"and summary rebuild)"
+        ))
@@ -0,0 +1,71 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from employees.simulator import Scenario, compare, load_payroll_data, project
+
+
+def department_raise(value):
+    name, _, pct = value.rpartition('=')
+    if not name:
+        raise ValueError(f"expected DEPARTMENT=PERCENT, got {value!r}")
+    return name, float(pct)
+
+
+class Command(BaseCommand):
+    help = (
+        "Project payroll cost by department under a what-if scenario (raises, extra leave, "
+        "allowances) from a year of attendance, without changing any data. Needs numpy and pandas."
+    )
+
+    def add_arguments(self, parser):
+        today = timezone.localdate()
+        parser.add_argument('--year', type=int, default=today.year - 1,
+                            help="Year whose attendance the projection is based on (default: last year)")
+        parser.add_argument('--target-year', type=int, default=today.year + 1,
+                            help="Year to project (default: next year)")
+        parser.add_argument('--raise', dest='raise_pct', type=float, default=0,
+                            help="Raise for every employee, in percent")
+        parser.add_argument('--department-raise', type=department_raise, action='append', default=[],
+                            metavar='DEPARTMENT=PERCENT',
+                            help="Raise for one department instead of --raise (repeatable)")
+        parser.add_argument('--extra-leave-days', type=float, default=0,
+                            help="Extra (unpaid) leave days per employee per year")
+        parser.add_argument('--allowance', type=float, default=0, help="Extra monthly allowance per employee")
+        parser.add_argument('--deduction', type=float, default=0, help="Extra monthly deduction per employee")
+        parser.add_argument('--monthly', action='store_true', help="Also print the projected cost per month")
+
+    def handle(self, *args, **options):
+        scenario = Scenario(
+            raise_pct=options['raise_pct'],
+            department_raises=dict(options['department_raise']),
+            extra_leave_days=options['extra_leave_days'],
+            allowance=options['allowance'],
+            deduction=options['deduction'],
+        )
+        try:
+            # Imported here so the timings below leave out the import
+            import numpy, pandas  # noqa: F401
+            started = time.perf_counter()
+            data = load_payroll_data(options['year'])
+            loaded = time.perf_counter()
+            comparison = compare(data, scenario, options['target_year'])
+            projected = time.perf_counter()
+            monthly = project(data, scenario, options['target_year']) if options['monthly'] else None
+        except ImportError as e:
+            raise CommandError(f"The simulator needs numpy and pandas: {e}")
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f"{len(data)} active employees, attendance of {options['year']}, "
+            f"projected for {options['target_year']}\n"
+        )
+        self.stdout.write(comparison.to_string(float_format=lambda value: f'{value:,.2f}'))
+        if monthly is not None:
+            self.stdout.write('')
+            self.stdout.write(monthly.to_string(float_format=lambda value: f'{value:,.0f}'))
+        self.stdout.write(self.style.SUCCESS(
+            f"\nLoaded in {(loaded - started) * 1000:.0f} ms, projected in {(projected - loaded) * 1000:.1f} ms"
+        ))
@@ -0,0 +1,236 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+
+logger = logging.getLogger(__name__)
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Recorder of the request being served; copied into sync_to_async threads
+_current = ContextVar('metrics_recorder', default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, in Prometheus' layout"""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def expose(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_labels(labels, le=bound)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(labels)} {total:g}')
+            lines.append(f'{self.name}_count{_labels(labels)} {cumulative}')
+        return lines
+
+
+class CounterMetric:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._series = Counter()
+
+    def inc(self, labels, value=1):
+        self._series[labels] += value
+
+    def expose(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for labels, value in sorted(self._series.items()):
+            lines.append(f'{self.name}{_labels(labels)} {value:g}')
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels, **extra):
+    pairs = list(zip(('view', 'method'), labels)) + list(extra.items())
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+class Registry:
+    """Request metrics of this process, labelled by URL name and HTTP method"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_seconds = Histogram(
+            'payease_request_duration_seconds', "Time to produce the response", SECONDS_BUCKETS,
+        )
+        self.queries = Histogram(
+            'payease_db_queries_per_request', "Database queries run by a request", QUERY_COUNT_BUCKETS,
+        )
+        self.query_seconds = CounterMetric(
+            'payease_db_query_seconds_total', "Time spent in database queries",
+        )
+        self.render_seconds = Histogram(
+            'payease_template_render_seconds', "Time spent rendering the page template", SECONDS_BUCKETS,
+        )
+        self.n_plus_one = CounterMetric(
+            'payease_n_plus_one_requests_total',
+            "Requests that ran the same SQL at least METRICS_N_PLUS_ONE_THRESHOLD times",
+        )
+
+    def record(self, labels, seconds, recorder):
+        with self._lock:
+            self.request_seconds.observe(labels, seconds)
+            self.queries.observe(labels, recorder.query_count)
+            self.query_seconds.inc(labels, recorder.query_seconds)
+            if recorder.render_count:
+                self.render_seconds.observe(labels, recorder.render_seconds)
+            if recorder.repeated_sql:
+                self.n_plus_one.inc(labels)
+
+    def expose(self):
+        with self._lock:
+            lines = []
+            for metric in (self.request_seconds, self.queries, self.query_seconds,
+                           self.render_seconds, self.n_plus_one):
+                lines += metric.expose()
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class RequestRecorder:
+    """
+    Query and render timings of one request. Its sync_to_async calls may
+    run queries on more than one thread, so updates take a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.query_count = 0
+        self.query_seconds = 0.0
+        self.render_count = 0
+        self.render_seconds = 0.0
+        self.statements = Counter()
+        self.repeated_sql = None
+
+    def add_query(self, sql, seconds):
+        with self._lock:
+            self.query_count += 1
+            self.query_seconds += seconds
+            self.statements[sql] += 1
+
+    def add_render(self, seconds):
+        with self._lock:
+            self.render_count += 1
+            self.render_seconds += seconds
+
+    def finish(self, threshold):
+        # Same statement with different parameters, e.g. a lazy FK in a loop
+        if self.statements:
+            sql, count = self.statements.most_common(1)[0]
+            if count >= threshold:
+                self.repeated_sql = (sql, count)
+
+
+def record_query(execute, sql, params, many, context):
+    """execute_wrapper installed on every connection; a no-op outside a request"""
+    recorder = _current.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.add_query(sql, time.perf_counter() - started)
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    """connection_created receiver"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def instrument_template_render(template_class):
+    """Time the top-level render() of a template backend's templates"""
+    render = template_class.render
+
+    def timed_render(self, *args, **kwargs):
+        recorder = _current.get()
+        if recorder is None:
+            return render(self, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            recorder.add_render(time.perf_counter() - started)
+
+    template_class.render = timed_render
+
+
+class MetricsMiddleware:
+    """
+    Record latency, queries and template render time for each request,
+    labelled by the resolved URL name. Exposed at /metrics/.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        recorder = RequestRecorder()
+        token = _current.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, time.perf_counter() - started, recorder)
+        return response
+
+    async def __acall__(self, request):
+        recorder = RequestRecorder()
+        token = _current.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, time.perf_counter() - started, recorder)
+        return response
+
+    def record(self, request, seconds, recorder):
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        recorder.finish(settings.METRICS_N_PLUS_ONE_THRESHOLD)
+        if recorder.repeated_sql:
+            sql, count = recorder.repeated_sql
+            logger.warning("Possible N+1 in %s: %d x %s", view, count, sql)
+        registry.record((view, request.method), seconds, recorder)
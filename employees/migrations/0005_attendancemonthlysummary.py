@@ -0,0 +1,55 @@
+# Generated by Django 5.2.5 on 2026-10-17 07:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def backfill_summaries(apps, schema_editor):
+    Attendance = apps.get_model('employees', 'Attendance')
+    AttendanceMonthlySummary = apps.get_model('employees', 'AttendanceMonthlySummary')
+    rows = (
+        Attendance.objects.order_by()
+        .annotate(year=ExtractYear('date'), month=ExtractMonth('date'))
+        .values('employee_id', 'year', 'month')
+        .annotate(
+            days_present=Count('pk', filter=Q(status='present')),
+            days_absent=Count('pk', filter=Q(status='absent')),
+            days_on_leave=Count('pk', filter=Q(status='leave')),
+            half_days=Count('pk', filter=Q(status='half_day')),
+        )
+    )
+    AttendanceMonthlySummary.objects.bulk_create(
+        [AttendanceMonthlySummary(**row) for row in rows.iterator()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0004_payrollrun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceMonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('days_present', models.IntegerField(default=0)),
+                ('days_absent', models.IntegerField(default=0)),
+                ('days_on_leave', models.IntegerField(default=0)),
+                ('half_days', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to='employees.employee')),
+            ],
+            options={
+                'ordering': ['-year', '-month'],
+                'unique_together': {('employee', 'year', 'month')},
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE employees_employee_fts "
+            "USING fts5(employee_id, full_name, email, prefix='2 3')"
+        )
+        schema_editor.execute(
+            "INSERT INTO employees_employee_fts (rowid, employee_id, full_name, email) "
+            "SELECT id, employee_id, full_name, email FROM employees_employee"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            "CREATE INDEX employees_employee_search_trgm ON employees_employee "
+            "USING gin ((employee_id || ' ' || full_name || ' ' || email) gin_trgm_ops)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS employees_employee_fts")
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS employees_employee_search_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_attendancemonthlysummary'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
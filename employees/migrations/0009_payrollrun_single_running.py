@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-17 08:20
+
+from django.db import migrations, models
+
+
+def fail_superseded_runs(apps, schema_editor):
+    # Keep only the latest run in progress for each month
+    PayrollRun = apps.get_model('employees', 'PayrollRun')
+    seen = set()
+    for run in PayrollRun.objects.filter(status='running').order_by('-started_at', '-pk'):
+        if (run.month, run.year) in seen:
+            run.status = 'failed'
+            run.save(update_fields=['status'])
+        seen.add((run.month, run.year))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0008_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='payrollrun',
+            name='status',
+            field=models.CharField(choices=[('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='running', max_length=20),
+        ),
+        migrations.RunPython(fail_superseded_runs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='payrollrun',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'running')), fields=('month', 'year'), name='payroll_run_single_running'),
+        ),
+    ]
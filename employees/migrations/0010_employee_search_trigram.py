@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def rebuild_fts(tokenizer):
+    def rebuild(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        schema_editor.execute("DROP TABLE IF EXISTS employees_employee_fts")
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE employees_employee_fts "
+            f"USING fts5(employee_id, full_name, email, {tokenizer})"
+        )
+        schema_editor.execute(
+            "INSERT INTO employees_employee_fts (rowid, employee_id, full_name, email) "
+            "SELECT id, employee_id, full_name, email FROM employees_employee"
+        )
+    return rebuild
+
+
+class Migration(migrations.Migration):
+    """Substring matching on SQLite, like ILIKE on PostgreSQL (needs SQLite 3.34+)"""
+
+    dependencies = [
+        ('employees', '0009_payrollrun_single_running'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_fts("tokenize='trigram'"), rebuild_fts("prefix='2 3'")),
+    ]
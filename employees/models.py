@@ -45,6 +45,11 @@ class Employee(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], condition=models.Q(is_active=True), name='employee_active_idx'),
+            models.Index(fields=['email'], name='employee_email_idx'),
+            models.Index(fields=['created_at'], name='employee_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.full_name} ({self.employee_id})"
@@ -67,11 +72,36 @@ class Attendance(models.Model):
     class Meta:
         unique_together = ['employee', 'date']
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date'], name='attendance_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.employee.full_name} - {self.date} - {self.status}"
 
 
+class AttendanceMonthlySummary(models.Model):
+    """Per-employee attendance counts for one month, kept in step with Attendance"""
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='attendance_summaries')
+    year = models.IntegerField()
+    month = models.IntegerField()  # 1-12
+    days_present = models.IntegerField(default=0)
+    days_absent = models.IntegerField(default=0)
+    days_on_leave = models.IntegerField(default=0)
+    half_days = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['employee', 'year', 'month']
+        ordering = ['-year', '-month']
+        indexes = [
+            models.Index(fields=['year', 'month'], name='attendance_summary_period_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.full_name} - {self.month}/{self.year}"
+
+
 class Salary(models.Model):
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='salaries')
     month = models.IntegerField()  # 1-12
@@ -103,6 +133,13 @@ class Salary(models.Model):
     class Meta:
         unique_together = ['employee', 'month', 'year']
         ordering = ['-year', '-month']
+        indexes = [
+            # Boolean filters compile to a bare "WHERE is_paid", which only a
+            # partial index can serve
+            models.Index(fields=['year', 'month'], condition=models.Q(is_paid=True), name='salary_paid_period_idx'),
+            models.Index(fields=['year', 'month'], condition=models.Q(is_paid=False), name='salary_unpaid_period_idx'),
+            models.Index(fields=['year', 'month'], name='salary_period_idx'),
+        ]
 
     def __str__(self):
         return f"{self.employee.full_name} - {self.get_month_display()} {self.year}"
@@ -148,13 +185,17 @@ class Payment(models.Model):
 
     class Meta:
         ordering = ['-payment_date']
+        indexes = [
+            models.Index(fields=['payment_date'], name='payment_date_idx'),
+        ]
 
     def __str__(self):
         return f"Payment for {self.salary.employee.full_name} - {self.payment_date}"
 
 
 class Transaction(models.Model):
-    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='transactions')
+    # Indexed by transaction_employee_date_idx, which leads with the employee
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='transactions', db_index=False)
     payment = models.ForeignKey(Payment, on_delete=models.CASCADE, related_name='transactions')
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     transaction_date = models.DateField()
@@ -163,6 +204,10 @@ class Transaction(models.Model):
 
     class Meta:
         ordering = ['-transaction_date']
+        indexes = [
+            models.Index(fields=['employee', 'transaction_date'], name='transaction_employee_date_idx'),
+            models.Index(fields=['transaction_date'], name='transaction_date_idx'),
+        ]
 
     def __str__(self):
         return f"Transaction - {self.employee.full_name} - {self.amount}"
@@ -175,7 +220,8 @@ class Notification(models.Model):
         ('payment_processed', 'Payment Processed'),
     ]
     
-    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='notifications')
+    # Indexed by notification_employee_idx, which leads with the employee
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='notifications', db_index=False)
     notification_type = models.CharField(max_length=20, choices=NOTIFICATION_TYPES)
     title = models.CharField(max_length=200)
     message = models.TextField()
@@ -184,6 +230,98 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['employee', 'created_at'], name='notification_employee_idx'),
+            models.Index(fields=['created_at'], name='notification_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.employee.full_name} - {self.title}"
+
+
+class PayrollRun(models.Model):
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    month = models.IntegerField()  # 1-12
+    year = models.IntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+
+    # Checkpoint: employees are processed in pk order, so everything up to
+    # last_employee_pk has already been written for this run.
+    last_employee_pk = models.BigIntegerField(default=0)
+    employees_processed = models.IntegerField(default=0)
+    salaries_created = models.IntegerField(default=0)
+    salaries_updated = models.IntegerField(default=0)
+    salaries_skipped = models.IntegerField(default=0)
+
+    started_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='payroll_runs')
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+        constraints = [
+            # At most one run in progress per month
+            models.UniqueConstraint(
+                fields=['month', 'year'], condition=models.Q(status='running'), name='payroll_run_single_running',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Payroll run {self.month}/{self.year} ({self.status})"
+
+
+class Job(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)  # key in employees.jobs.JOB_HANDLERS
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+
+    progress = models.IntegerField(default=0)
+    total = models.IntegerField(null=True, blank=True)
+    message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    # Failed attempts are retried with exponential backoff until max_attempts
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['run_after'], condition=models.Q(status='queued'), name='job_queued_idx'),
+            models.Index(fields=['status', 'updated_at'], name='job_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    @property
+    def percent(self):
+        if not self.total:
+            return 100 if self.status == 'succeeded' else 0
+        return min(100, int(self.progress * 100 / self.total))
+
+    @property
+    def is_finished(self):
+        return self.status in ('succeeded', 'failed')
@@ -0,0 +1,112 @@
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Employee, Notification
+from .pubsub import publish_notifications
+
+
+NOTIFICATION_BATCH_SIZE = 1000
+
+
+def unread_cache_key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def unread_count(user_id):
+    """Unread notifications of the employee linked to a user, served from the cache"""
+    key = unread_cache_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(employee__user_id=user_id, is_read=False).count()
+        cache.set(key, count, settings.UNREAD_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def _apply_deltas(deltas):
+    for user_id, delta in deltas.items():
+        if not delta:
+            continue
+        try:
+            cache.incr(unread_cache_key(user_id), delta)
+        except ValueError:
+            # Not cached; the next read counts from the database
+            pass
+
+
+def adjust_unread(user_deltas):
+    """Shift cached counters by {user_id: delta} once the transaction commits"""
+    deltas = {user_id: delta for user_id, delta in user_deltas.items() if user_id is not None}
+    if deltas:
+        transaction.on_commit(lambda: _apply_deltas(deltas))
+
+
+def adjust_unread_for_employees(employee_deltas):
+    """adjust_unread() for {employee_id: delta}, resolving the linked users in one query"""
+    users = dict(
+        Employee.objects.filter(pk__in=employee_deltas, user__isnull=False).values_list('pk', 'user_id')
+    )
+    adjust_unread({users[pk]: delta for pk, delta in employee_deltas.items() if pk in users})
+
+
+def forget_unread(user_ids):
+    """Drop cached counters so they are recounted on next read"""
+    keys = [unread_cache_key(user_id) for user_id in user_ids if user_id is not None]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def mark_read(notification):
+    """Mark one notification read with a single UPDATE"""
+    updated = Notification.objects.filter(pk=notification.pk, is_read=False).update(is_read=True)
+    if updated:
+        notification.is_read = True
+        adjust_unread_for_employees({notification.employee_id: -1})
+    return bool(updated)
+
+
+def mark_all_read(employee):
+    """Mark every unread notification of an employee read"""
+    updated = Notification.objects.filter(employee=employee, is_read=False).update(is_read=True)
+    if employee.user_id is not None:
+        user_id = employee.user_id
+        transaction.on_commit(lambda: cache.set(unread_cache_key(user_id), 0, settings.UNREAD_COUNT_CACHE_TIMEOUT))
+    return updated
+
+
+def broadcast(employees, notification_type, title, message, batch_size=NOTIFICATION_BATCH_SIZE):
+    """
+    Send the same notification to many employees.
+
+    Rows are inserted with bulk_create in batches, each recipient's cached
+    unread counter is incremented and open notification streams are
+    pushed the new row. Returns the number sent.
+    """
+    sent = 0
+    with transaction.atomic():
+        recipients = employees.values_list('pk', 'user_id').order_by('pk').iterator(chunk_size=batch_size)
+        batch = []
+        user_ids = []
+
+        def flush():
+            created = Notification.objects.bulk_create(batch)
+            publish_notifications(zip(user_ids[-len(batch):], created))
+            return len(created)
+
+        for employee_id, user_id in recipients:
+            batch.append(Notification(
+                employee_id=employee_id,
+                notification_type=notification_type,
+                title=title,
+                message=message,
+            ))
+            user_ids.append(user_id)
+            if len(batch) >= batch_size:
+                sent += flush()
+                batch = []
+        if batch:
+            sent += flush()
+        adjust_unread(Counter(user_ids))
+    return sent
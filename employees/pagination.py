@@ -0,0 +1,143 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset, with cursors to its neighbours"""
+
+    def __init__(self, object_list, next_cursor, previous_cursor, page_size, query_params):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.page_size = page_size
+        self._query_params = query_params
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def _query(self, **cursor):
+        params = [(k, v) for k, v in self._query_params if k not in ('after', 'before')]
+        return urlencode(params + list(cursor.items()))
+
+    @property
+    def next_query(self):
+        return self._query(after=self.next_cursor)
+
+    @property
+    def previous_query(self):
+        return self._query(before=self.previous_cursor)
+
+    @property
+    def first_query(self):
+        return self._query()
+
+
+def _parse_ordering(ordering):
+    return [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+
+def _encode_value(value):
+    # isoformat keeps full microsecond precision, unlike DjangoJSONEncoder
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(obj, ordering):
+    values = [_encode_value(getattr(obj, name)) for name, _ in _parse_ordering(ordering)]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, ordering):
+    """Return the key values stored in a cursor, or None if it is not valid"""
+    keys = _parse_ordering(ordering)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        # Sort keys are never null, and seeking from a null key is not possible
+        if not isinstance(values, list) or len(values) != len(keys) or None in values:
+            return None
+        return [
+            (model._meta.pk if name == 'pk' else model._meta.get_field(name)).to_python(value)
+            for (name, _), value in zip(keys, values)
+        ]
+    except (TypeError, ValueError, binascii.Error, ValidationError):
+        # A tampered cursor can hold any JSON, e.g. an object where a date belongs
+        return None
+
+
+def _seek_filter(ordering, values, forward):
+    """Rows strictly after (forward) or before the given key in the ordering"""
+    condition = Q()
+    equal = {}
+    for (name, descending), value in zip(_parse_ordering(ordering), values):
+        lookup = 'lt' if descending == forward else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
+
+
+def _reverse_ordering(ordering):
+    return [name[1:] if name.startswith('-') else f'-{name}' for name in ordering]
+
+
+def keyset_paginate(request, queryset, ordering):
+    """
+    Paginate a queryset by seeking from a cursor instead of using OFFSET.
+
+    ordering must end with a unique field (usually pk) so every row has a
+    distinct key. The page is selected with ?after=<cursor> or
+    ?before=<cursor>, and ?page_size= overrides settings.PAGE_SIZE up to
+    settings.MAX_PAGE_SIZE.
+    """
+    try:
+        page_size = int(request.GET.get('page_size', settings.PAGE_SIZE))
+    except ValueError:
+        page_size = settings.PAGE_SIZE
+    page_size = max(1, min(page_size, settings.MAX_PAGE_SIZE))
+
+    model = queryset.model
+    after = request.GET.get('after')
+    before = request.GET.get('before')
+    after_key = decode_cursor(after, model, ordering) if after else None
+    before_key = decode_cursor(before, model, ordering) if before else None
+
+    if before_key is not None:
+        rows = list(
+            queryset.filter(_seek_filter(ordering, before_key, forward=False))
+            .order_by(*_reverse_ordering(ordering))[:page_size + 1]
+        )
+        has_previous = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        has_next = True
+    else:
+        if after_key is not None:
+            queryset = queryset.filter(_seek_filter(ordering, after_key, forward=True))
+        rows = list(queryset.order_by(*ordering)[:page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        has_previous = after_key is not None
+
+    next_cursor = encode_cursor(rows[-1], ordering) if rows and has_next else None
+    previous_cursor = encode_cursor(rows[0], ordering) if rows and has_previous else None
+    return KeysetPage(rows, next_cursor, previous_cursor, page_size, list(request.GET.items()))
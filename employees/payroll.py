@@ -0,0 +1,232 @@
+from calendar import monthrange
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .dashboard import invalidate_dashboard
+from .notify import adjust_unread
+from .pubsub import publish_notifications
+from .models import Employee, AttendanceMonthlySummary, Salary, Payment, Transaction, Notification, PayrollRun
+
+
+PAYROLL_CHUNK_SIZE = 500
+
+# Salary columns written by a payroll run (bulk_update skips auto_now, so
+# updated_at is set explicitly).
+CALCULATED_FIELDS = [
+    'base_salary', 'total_working_days', 'days_present', 'days_absent',
+    'days_on_leave', 'half_days', 'salary_per_day', 'calculated_amount',
+    'net_salary', 'updated_at',
+]
+
+
+def attendance_counts(year, month, employee_ids=None):
+    """Per-employee status counts for a month, read from the monthly summary table"""
+    summaries = AttendanceMonthlySummary.objects.filter(year=year, month=month)
+    if employee_ids is not None:
+        summaries = summaries.filter(employee_id__in=employee_ids)
+
+    return {
+        employee_id: {'present': present, 'absent': absent, 'leave': leave, 'half_day': half_day}
+        for employee_id, present, absent, leave, half_day in summaries.values_list(
+            'employee_id', 'days_present', 'days_absent', 'days_on_leave', 'half_days'
+        )
+    }
+
+
+def apply_attendance(salary, counts, total_days):
+    """Copy attendance counts onto a salary and recalculate it in memory"""
+    counts = counts or {}
+    salary.total_working_days = total_days
+    salary.days_present = counts.get('present', 0)
+    salary.days_absent = counts.get('absent', 0)
+    salary.days_on_leave = counts.get('leave', 0)
+    salary.half_days = counts.get('half_day', 0)
+    return salary.calculate_salary()
+
+
+def start_payroll_run(month, year, user=None, restart=False):
+    """
+    The month's run in progress, or a new one. With restart, a run in
+    progress is marked failed and a new one started in its place.
+    """
+    try:
+        with transaction.atomic():
+            running = PayrollRun.objects.select_for_update().filter(month=month, year=year, status='running')
+            if restart:
+                running.update(status='failed', completed_at=timezone.now())
+            else:
+                run = running.first()
+                if run is not None:
+                    return run
+            return PayrollRun.objects.create(month=month, year=year, started_by=user)
+    except IntegrityError:
+        # Another process started a run for the month at the same time; join it
+        return PayrollRun.objects.get(month=month, year=year, status='running')
+
+
+def run_payroll(month, year, user=None, chunk_size=PAYROLL_CHUNK_SIZE, restart=False, progress=None):
+    """
+    Create or recalculate the salary of every active employee for a month.
+
+    Work is committed one chunk at a time together with the run checkpoint,
+    so an interrupted run picks up after the last finished chunk. Paid
+    salaries are left untouched. Processes running the same month share
+    the run, each chunk being taken under a lock on it; a run superseded
+    by a restart stops and is returned with status 'failed'.
+    """
+    run = start_payroll_run(month, year, user=user, restart=restart)
+
+    total_days = monthrange(year, month)[1]
+    counts = attendance_counts(year, month)
+
+    while True:
+        with transaction.atomic():
+            # The checkpoint is read under the lock, so no chunk is taken twice
+            run = PayrollRun.objects.select_for_update().get(pk=run.pk)
+            if run.status != 'running':
+                break
+
+            chunk = list(
+                Employee.objects.filter(is_active=True, pk__gt=run.last_employee_pk)
+                .order_by('pk')
+                .values_list('pk', 'base_salary')[:chunk_size]
+            )
+            if not chunk:
+                run.status = 'completed'
+                run.completed_at = timezone.now()
+                run.save()
+                break
+
+            existing = {
+                salary.employee_id: salary
+                for salary in Salary.objects.filter(
+                    month=month, year=year, employee_id__in=[pk for pk, _ in chunk]
+                )
+            }
+            now = timezone.now()
+            to_create = []
+            to_update = []
+            for employee_pk, base_salary in chunk:
+                salary = existing.get(employee_pk)
+                if salary is None:
+                    salary = Salary(employee_id=employee_pk, month=month, year=year)
+                    to_create.append(salary)
+                elif salary.is_paid:
+                    run.salaries_skipped += 1
+                    continue
+                else:
+                    salary.updated_at = now
+                    to_update.append(salary)
+                salary.base_salary = base_salary
+                apply_attendance(salary, counts.get(employee_pk), total_days)
+
+            Salary.objects.bulk_create(to_create)
+            Salary.objects.bulk_update(to_update, CALCULATED_FIELDS)
+
+            run.last_employee_pk = chunk[-1][0]
+            run.employees_processed += len(chunk)
+            run.salaries_created += len(to_create)
+            run.salaries_updated += len(to_update)
+            run.save()
+            invalidate_dashboard()
+
+        if progress:
+            progress(run)
+
+    return run
+
+
+def pay_salaries(salary_ids, payment_date, payment_method, transaction_prefix='', notes='', user=None):
+    """
+    Pay many salaries in one transaction.
+
+    Payments, transactions and notifications are inserted with bulk_create
+    and the salaries are flagged paid with a single update(). Returns one
+    {'salary_id', 'employee', 'success', 'message'} dict per requested id.
+    """
+    salary_ids = list(dict.fromkeys(salary_ids))
+    results = {}
+
+    with transaction.atomic():
+        salaries = {
+            salary.pk: salary
+            for salary in Salary.objects.select_for_update(of=('self',))
+            .select_related('employee')
+            .filter(pk__in=salary_ids)
+        }
+        already_paid = set(
+            Payment.objects.filter(salary_id__in=salaries).values_list('salary_id', flat=True)
+        )
+
+        payable = []
+        for salary_id in salary_ids:
+            salary = salaries.get(salary_id)
+            if salary is None:
+                results[salary_id] = (None, False, 'Salary not found')
+            elif salary.is_paid or salary_id in already_paid:
+                results[salary_id] = (salary.employee, False, 'Already paid')
+            elif salary.net_salary <= 0:
+                results[salary_id] = (salary.employee, False, 'Net salary has not been calculated')
+            else:
+                payable.append(salary)
+
+        payments = Payment.objects.bulk_create([
+            Payment(
+                salary=salary,
+                payment_date=payment_date,
+                payment_method=payment_method,
+                transaction_id=f"{transaction_prefix}-{salary.pk}" if transaction_prefix else '',
+                notes=notes,
+                processed_by=user,
+            )
+            for salary in payable
+        ])
+        if any(payment.pk is None for payment in payments):
+            # Backends that cannot return ids from a bulk insert
+            by_salary = Payment.objects.in_bulk([s.pk for s in payable], field_name='salary_id')
+            payments = [by_salary[salary.pk] for salary in payable]
+
+        Salary.objects.filter(pk__in=[salary.pk for salary in payable]).update(
+            is_paid=True, updated_at=timezone.now()
+        )
+
+        Transaction.objects.bulk_create([
+            Transaction(
+                employee=salary.employee,
+                payment=payment,
+                amount=salary.net_salary,
+                transaction_date=payment_date,
+                description=f"Salary payment for {salary.get_month_display()} {salary.year}",
+            )
+            for salary, payment in zip(payable, payments)
+        ])
+
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                employee=salary.employee,
+                notification_type='salary_paid',
+                title='Salary Paid',
+                message=f'Your salary for {salary.get_month_display()} {salary.year} has been processed. Amount: ₹{salary.net_salary}',
+            )
+            for salary in payable
+        ])
+        adjust_unread(Counter(salary.employee.user_id for salary in payable))
+        publish_notifications(
+            (salary.employee.user_id, notification) for salary, notification in zip(payable, notifications)
+        )
+
+        for salary in payable:
+            salary.is_paid = True
+            results[salary.pk] = (salary.employee, True, 'Paid')
+
+        # Bulk writes skip model signals
+        if payable:
+            invalidate_dashboard()
+
+    summary = []
+    for salary_id in salary_ids:
+        employee, success, message = results[salary_id]
+        summary.append({'salary_id': salary_id, 'employee': employee, 'success': success, 'message': message})
+    return summary
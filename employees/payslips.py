@@ -0,0 +1,181 @@
+import calendar
+import io
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import django
+from django.conf import settings
+
+from .models import Salary, Payment
+
+
+PAYSLIP_DIR = 'payslips'
+
+PAYMENT_METHOD_LABELS = dict(Payment.PAYMENT_METHOD_CHOICES)
+
+PAYSLIP_FIELDS = [
+    'pk', 'month', 'year', 'updated_at', 'employee__updated_at', 'is_paid',
+    'base_salary', 'total_working_days', 'days_present', 'days_absent', 'days_on_leave', 'half_days',
+    'salary_per_day', 'calculated_amount', 'allowances', 'deductions', 'net_salary',
+    'employee__employee_id', 'employee__full_name', 'employee__designation', 'employee__department',
+    'employee__bank_name', 'employee__account_number',
+    'payment__payment_date', 'payment__payment_method', 'payment__transaction_id',
+]
+
+
+def payslip_data(salaries):
+    """Everything a payslip shows, as plain dicts, from a single query"""
+    return list(salaries.order_by('pk').values(*PAYSLIP_FIELDS))
+
+
+def payslip_path(data):
+    """Cache file for a salary; the name changes whenever the salary or its employee is updated"""
+    version = '-'.join(
+        timestamp.strftime('%Y%m%d%H%M%S%f') for timestamp in (data['updated_at'], data['employee__updated_at'])
+    )
+    return (
+        Path(settings.PRIVATE_MEDIA_ROOT) / PAYSLIP_DIR / str(data['year']) / f"{data['month']:02d}"
+        / f"{data['pk']}-{version}.pdf"
+    )
+
+
+def _money(value):
+    return f"Rs. {value:,.2f}"
+
+
+def render_payslip(data):
+    """Render one payslip to PDF bytes. Only needs the plain dict from payslip_data()."""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import mm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    styles = getSampleStyleSheet()
+    period = f"{calendar.month_name[data['month']]} {data['year']}"
+    grid = TableStyle([
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, 0), (0, -1), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ])
+
+    def table(rows):
+        return Table(rows, colWidths=[60 * mm, 100 * mm], style=grid, hAlign='LEFT')
+
+    if data['payment__payment_date']:
+        payment = [
+            ['Status', 'Paid'],
+            ['Payment Date', data['payment__payment_date'].strftime('%d %b %Y')],
+            ['Payment Method', PAYMENT_METHOD_LABELS.get(data['payment__payment_method'], '-')],
+            ['Transaction ID', data['payment__transaction_id'] or '-'],
+        ]
+    else:
+        payment = [['Status', 'Paid' if data['is_paid'] else 'Pending']]
+
+    story = [
+        Paragraph('PayEase', styles['Title']),
+        Paragraph(f"Payslip for {period}", styles['Heading2']),
+        Spacer(1, 4 * mm),
+        table([
+            ['Employee', data['employee__full_name']],
+            ['Employee ID', data['employee__employee_id']],
+            ['Designation', data['employee__designation']],
+            ['Department', data['employee__department']],
+            ['Bank', f"{data['employee__bank_name']} ({data['employee__account_number']})"],
+        ]),
+        Spacer(1, 6 * mm),
+        Paragraph('Attendance', styles['Heading3']),
+        table([
+            ['Working Days', data['total_working_days']],
+            ['Days Present', data['days_present']],
+            ['Days Absent', data['days_absent']],
+            ['Days on Leave', data['days_on_leave']],
+            ['Half Days', data['half_days']],
+        ]),
+        Spacer(1, 6 * mm),
+        Paragraph('Earnings and Deductions', styles['Heading3']),
+        table([
+            ['Base Salary', _money(data['base_salary'])],
+            ['Salary per Day', _money(data['salary_per_day'])],
+            ['Calculated Amount', _money(data['calculated_amount'])],
+            ['Allowances', _money(data['allowances'])],
+            ['Deductions', _money(data['deductions'])],
+            ['Net Salary', _money(data['net_salary'])],
+        ]),
+        Spacer(1, 6 * mm),
+        Paragraph('Payment', styles['Heading3']),
+        table(payment),
+    ]
+
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4, title=f"Payslip {period}").build(story)
+    return buffer.getvalue()
+
+
+def write_payslip(data, path, force=False):
+    """Render the payslip to path unless it is already cached. Returns True if it was rendered."""
+    path = Path(path)
+    if path.exists() and not force:
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pdf = render_payslip(data)
+    # A file of its own per writer, so concurrent renders of one slip never interleave
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix='.tmp', delete=False) as tmp:
+        tmp.write(pdf)
+    try:
+        os.replace(tmp.name, path)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+
+    # Drop slips rendered for earlier versions of the salary
+    for stale in path.parent.glob(f"{data['pk']}-*.pdf"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return True
+
+
+def _write_payslip_job(job):
+    data, path, force = job
+    return write_payslip(data, path, force)
+
+
+def get_payslip(salary):
+    """Path to the PDF payslip of a salary, rendering it if needed"""
+    data = payslip_data(Salary.objects.filter(pk=salary.pk))[0]
+    path = payslip_path(data)
+    write_payslip(data, path)
+    return path
+
+
+def generate_payslips(month, year, workers=None, force=False):
+    """
+    Render the payslips of a month across a pool of processes.
+
+    Slips already cached for the current version of their salary are
+    skipped unless force is set. Returns (rendered, cached).
+    """
+    jobs = []
+    cached = 0
+    for data in payslip_data(Salary.objects.filter(month=month, year=year)):
+        path = payslip_path(data)
+        if path.exists() and not force:
+            cached += 1
+        else:
+            jobs.append((data, path, force))
+
+    if not jobs:
+        return 0, cached
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        rendered = sum(_write_payslip_job(job) for job in jobs)
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        # Workers only render and write files; django.setup() lets them import this module
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            rendered = sum(pool.map(_write_payslip_job, jobs, chunksize=chunksize))
+    return rendered, cached
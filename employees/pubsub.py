@@ -0,0 +1,163 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict, deque
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
+
+from .models import Notification
+
+
+STREAM_QUEUE_SIZE = 100
+
+# Milliseconds the browser waits before reconnecting a dropped stream
+STREAM_RETRY_MS = 5000
+
+
+class NotificationHub:
+    """
+    In-process fan-out of new notifications to the event streams of each user.
+
+    Subscribers are asyncio queues living on the ASGI event loop; publish()
+    may be called from any thread (sync views run in a thread pool) and
+    hands messages over with call_soon_threadsafe, so an idle stream costs
+    one queue and no database work.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, user_id):
+        """Register a queue for user_id on the running event loop"""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(STREAM_QUEUE_SIZE))
+        with self._lock:
+            self._subscribers[user_id].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, user_id, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[user_id]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, user_id, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, message)
+            except RuntimeError:
+                # The stream's event loop has already closed
+                pass
+
+
+def _offer(queue, message):
+    # A stream that stopped reading loses its oldest messages, never blocks publishers
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(message)
+
+
+hub = NotificationHub()
+
+
+def notification_message(notification):
+    return {
+        'id': notification.pk,
+        'type': notification.notification_type,
+        'title': notification.title,
+        'message': notification.message,
+        'created_at': notification.created_at.isoformat(),
+    }
+
+
+def publish_notifications(recipients):
+    """Push (user_id, notification) pairs to open streams once the transaction commits"""
+    messages = [
+        (user_id, notification_message(notification))
+        for user_id, notification in recipients
+        if user_id is not None and notification.pk is not None
+    ]
+    if not messages:
+        return
+
+    def send():
+        for user_id, message in messages:
+            hub.publish(user_id, message)
+    transaction.on_commit(send)
+
+
+def _event(message):
+    return f"id: {message['id']}\nevent: notification\ndata: {json.dumps(message)}\n\n"
+
+
+@sync_to_async
+def _query_and_close(query, *args):
+    """
+    Run a query on the request's thread and close the connection after it.
+    Django would only close it when the stream ends, so each open stream
+    would hold a database connection (the view's own queries included).
+    """
+    try:
+        return query(*args)
+    finally:
+        connection.close()
+
+
+def _latest_id(employee_id):
+    return Notification.objects.filter(employee_id=employee_id).aggregate(last=Max('pk'))['last'] or 0
+
+
+def _notifications_after(employee_id, last_id):
+    rows = Notification.objects.filter(employee_id=employee_id, pk__gt=last_id).order_by('pk')[:STREAM_QUEUE_SIZE]
+    return [notification_message(notification) for notification in rows]
+
+
+async def notification_events(user_id, employee_id, last_id=None):
+    """
+    Server-sent events for the notifications of one employee.
+
+    New rows arrive through the hub. A reconnecting browser passes the last
+    id it saw and gets the rows it missed, including those written by other
+    processes, which the in-process hub cannot see. Only with
+    NOTIFICATION_STREAM_CATCHUP does each heartbeat query for them too.
+    No database connection is held between queries.
+    """
+    subscriber = hub.subscribe(user_id)
+    queue = subscriber[1]
+    sent = deque(maxlen=STREAM_QUEUE_SIZE)
+    try:
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        if last_id is None:
+            last_id = await _query_and_close(_latest_id, employee_id)
+            pending = []
+        else:
+            pending = await _query_and_close(_notifications_after, employee_id, last_id)
+
+        while True:
+            for message in pending:
+                if message['id'] not in sent:
+                    sent.append(message['id'])
+                    last_id = max(last_id, message['id'])
+                    yield _event(message)
+
+            try:
+                pending = [await asyncio.wait_for(queue.get(), settings.NOTIFICATION_STREAM_HEARTBEAT)]
+            except asyncio.TimeoutError:
+                pending = []
+                if settings.NOTIFICATION_STREAM_CATCHUP:
+                    pending = await _query_and_close(_notifications_after, employee_id, last_id)
+                if not pending:
+                    yield ": keep-alive\n\n"
+    finally:
+        hub.unsubscribe(user_id, subscriber)
@@ -0,0 +1,134 @@
+"""
+Read replica routing.
+
+When settings.DATABASES has a 'replica' database, reads made inside
+use_replica() (or a view decorated with read_from_replica) go to it; every
+other read and all writes go to 'default'. A request that writes is pinned
+to 'default' for the rest of the request, and ReplicaPinMiddleware keeps the
+user there for REPLICA_PIN_SECONDS afterwards, so pages read right after a
+write never miss it because of replication lag.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+REPLICA_DATABASE = 'replica'
+REPLICA_PIN_COOKIE = 'payease_primary'
+
+# Both copied into sync_to_async threads, like the metrics recorder
+_replica_reads = ContextVar('replica_reads', default=False)
+_request_state = ContextVar('replica_request_state', default=None)
+
+
+class RequestState:
+    """Whether the request being served must read from 'default'"""
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+@contextmanager
+def use_replica():
+    """Send reads made inside the block to the replica, if there is one"""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def read_from_replica(view):
+    """Run a (sync or async) read-only view under use_replica()"""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            with use_replica():
+                return await view(*args, **kwargs)
+    else:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with use_replica():
+                return view(*args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Listed in DATABASE_ROUTERS only when a replica is configured"""
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get():
+            return None
+        state = _request_state.get()
+        if state is not None and (state.pinned or state.wrote):
+            return None
+        # Inside a transaction on the primary, reads must see its writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return REPLICA_DATABASE
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        # Saving the session is not something the user reads back
+        if state is not None and model._meta.app_label != 'sessions':
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary
+        return False if db == REPLICA_DATABASE else None
+
+
+class ReplicaPinMiddleware:
+    """
+    Track writes per request and pin users who wrote to the primary for
+    REPLICA_PIN_SECONDS with a cookie.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if REPLICA_DATABASE not in settings.DATABASES:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state = RequestState(pinned=REPLICA_PIN_COOKIE in request.COOKIES)
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        return self.pin(response, state)
+
+    async def __acall__(self, request):
+        state = RequestState(pinned=REPLICA_PIN_COOKIE in request.COOKIES)
+        token = _request_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        return self.pin(response, state)
+
+    def pin(self, response, state):
+        if state.wrote:
+            response.set_cookie(
+                REPLICA_PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
@@ -0,0 +1,114 @@
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.urls import reverse
+
+from .models import Employee
+
+
+SEARCH_RESULT_LIMIT = 10
+MAX_SEARCH_RESULT_LIMIT = 50
+
+# SQLite: FTS5 table whose rowid is the employee pk, kept in sync from model signals.
+# Its trigram tokenizer matches substrings of at least three characters
+FTS_TABLE = 'employees_employee_fts'
+FTS_MIN_LENGTH = 3
+
+# PostgreSQL: the trigram GIN index is built on exactly this expression
+PG_SEARCH_EXPRESSION = "(employee_id || ' ' || full_name || ' ' || email)"
+
+
+def _fts_match(term):
+    """
+    FTS5 query matching the term anywhere in one column, as the ILIKE used on
+    PostgreSQL does; None when the term is too short for the trigram index
+    """
+    if len(term) < FTS_MIN_LENGTH:
+        return None
+    return '"{}"'.format(term.replace('"', '""'))
+
+
+def _like_pattern(term):
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def _icontains(term):
+    return Q(full_name__icontains=term) | Q(employee_id__icontains=term) | Q(email__icontains=term)
+
+
+def search_filter(term):
+    """Q selecting employees whose ID, name or email matches the term"""
+    if connection.vendor == 'sqlite':
+        match = _fts_match(term)
+        if match:
+            return Q(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+    elif connection.vendor == 'postgresql':
+        return Q(pk__in=RawSQL(
+            f"SELECT id FROM employees_employee WHERE {PG_SEARCH_EXPRESSION} ILIKE %s",
+            [_like_pattern(term)],
+        ))
+    return _icontains(term)
+
+
+def search_employees(term, limit=SEARCH_RESULT_LIMIT):
+    """Top matches for an autocomplete box, best first"""
+    columns = ['pk', 'employee_id', 'full_name', 'email', 'department']
+    match = _fts_match(term)
+
+    if connection.vendor == 'sqlite' and match:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT e.id, e.employee_id, e.full_name, e.email, e.department "
+                f"FROM {FTS_TABLE} f JOIN employees_employee e ON e.id = f.rowid "
+                f"WHERE {FTS_TABLE} MATCH %s ORDER BY f.rank LIMIT %s",
+                [match, limit],
+            )
+            rows = cursor.fetchall()
+    elif connection.vendor == 'postgresql':
+        rows = Employee.objects.filter(search_filter(term)).annotate(
+            rank=RawSQL(f"similarity({PG_SEARCH_EXPRESSION}, %s)", [term])
+        ).order_by('-rank').values_list(*columns)[:limit]
+    else:
+        rows = Employee.objects.filter(_icontains(term)).order_by('full_name').values_list(*columns)[:limit]
+
+    return [
+        {
+            'id': pk,
+            'employee_id': employee_id,
+            'full_name': full_name,
+            'email': email,
+            'department': department,
+            'url': reverse('employee_detail', args=[pk]),
+        }
+        for pk, employee_id, full_name, email, department in rows
+    ]
+
+
+def index_employee(employee):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [employee.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, employee_id, full_name, email) VALUES (%s, %s, %s, %s)",
+            [employee.pk, employee.employee_id, employee.full_name, employee.email],
+        )
+
+
+def unindex_employee(employee):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [employee.pk])
+
+
+def rebuild_search_index():
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, employee_id, full_name, email) "
+            f"SELECT id, employee_id, full_name, email FROM employees_employee"
+        )
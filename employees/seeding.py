@@ -0,0 +1,270 @@
+import csv
+import io
+import random
+import time
+from calendar import monthrange
+from datetime import date, time as dt_time, timedelta
+from decimal import Decimal
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.utils import timezone
+
+from .analytics import month_range, shift_month
+from .dashboard import invalidate_dashboard
+from .models import Employee, Attendance, Salary, Payment, Transaction, Notification
+from .payroll import apply_attendance
+from .search import rebuild_search_index
+from .summaries import rebuild_summaries
+
+
+SEED_CHUNK_SIZE = 5000
+
+# Employee ids of seeded employees start with this, so seeding never
+# collides with real employees and can tell whether it already ran
+SEED_EMPLOYEE_PREFIX = 'SEED'
+
+DEPARTMENTS = ['Engineering', 'Finance', 'Sales', 'Marketing', 'Operations', 'Support', 'HR', 'Legal']
+DESIGNATIONS = ['Associate', 'Analyst', 'Engineer', 'Senior Engineer', 'Lead', 'Manager']
+FIRST_NAMES = ['Aarav', 'Diya', 'Ishaan', 'Kavya', 'Rohan', 'Saanvi', 'Vihaan', 'Ananya', 'Arjun', 'Meera']
+LAST_NAMES = ['Sharma', 'Patel', 'Iyer', 'Reddy', 'Gupta', 'Nair', 'Singh', 'Das', 'Mehta', 'Rao']
+
+# Weights of present, absent, leave and half-day
+ATTENDANCE_WEIGHTS = [('present', 88), ('absent', 4), ('leave', 5), ('half_day', 3)]
+
+# Values the database driver binds as they are; others go through the field
+NATIVE_TYPES = (int, float, str, type(None))
+
+PAYMENT_METHODS = ['bank_transfer', 'bank_transfer', 'bank_transfer', 'upi', 'cheque', 'cash']
+
+
+def insert_method():
+    """COPY on PostgreSQL, raw executemany on SQLite, bulk_create elsewhere"""
+    if connection.vendor == 'postgresql':
+        return 'copy'
+    if connection.vendor == 'sqlite':
+        return 'executemany'
+    return 'bulk_create'
+
+
+class TableWriter:
+    """
+    Buffer rows for one table and insert them chunk_size at a time.
+
+    Rows are tuples in the order of `fields`, holding Python values. The
+    time spent inserting is tracked so rows per second can be reported
+    apart from the time spent generating the data.
+    """
+
+    def __init__(self, model, fields, method, chunk_size=SEED_CHUNK_SIZE):
+        self.model = model
+        self.fields = [model._meta.get_field(name) for name in fields]
+        self.method = method
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self.seconds = 0.0
+        self._buffer = []
+        # The connection proxy costs a thread-local lookup per use
+        self.connection = connections[DEFAULT_DB_ALIAS]
+
+        qn = self.connection.ops.quote_name
+        table = qn(model._meta.db_table)
+        columns = ', '.join(qn(field.column) for field in self.fields)
+        self._insert_sql = f"INSERT INTO {table} ({columns}) VALUES ({', '.join(['%s'] * len(self.fields))})"
+        self._copy_sql = f"COPY {table} ({columns}) FROM STDIN"
+
+    def add(self, row):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        started = time.perf_counter()
+        getattr(self, f'_write_{self.method}')(self._buffer)
+        self.seconds += time.perf_counter() - started
+        self.rows += len(self._buffer)
+        self._buffer = []
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def _write_executemany(self, rows):
+        connection = self.connection
+        # Dates, times and timestamps repeat across a chunk; adapt each once
+        adapted = {}
+
+        def adapt(field, value):
+            if isinstance(value, NATIVE_TYPES):
+                return value
+            key = (field, value)
+            if key not in adapted:
+                adapted[key] = field.get_db_prep_save(value, connection)
+            return adapted[key]
+
+        prepared = [[adapt(field, value) for field, value in zip(self.fields, row)] for row in rows]
+        with connection.cursor() as cursor:
+            cursor.executemany(self._insert_sql, prepared)
+
+    def _write_copy(self, rows):
+        with self.connection.cursor() as cursor:
+            if hasattr(cursor.cursor, 'copy'):
+                # psycopg 3 adapts Python values itself
+                with cursor.cursor.copy(self._copy_sql) as copy:
+                    for row in rows:
+                        copy.write_row(row)
+            else:
+                # psycopg2 reads CSV text; \N marks NULL so empty strings stay empty
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                for row in rows:
+                    writer.writerow(['\\N' if value is None else value for value in row])
+                buffer.seek(0)
+                cursor.cursor.copy_expert(f"{self._copy_sql} WITH (FORMAT csv, NULL '\\N')", buffer)
+
+    def _write_bulk_create(self, rows):
+        names = [field.attname for field in self.fields]
+        self.model.objects.bulk_create([self.model(**dict(zip(names, row))) for row in rows])
+
+
+def _employee_rows(rng, employees, joined_before, now):
+    for number in range(1, employees + 1):
+        yield (
+            f'{SEED_EMPLOYEE_PREFIX}{number:07d}',
+            f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            f'seed.employee{number}@example.com',
+            f'9{number:09d}',
+            f'{number} Seed Street',
+            joined_before - timedelta(days=rng.randrange(1, 3000)),
+            rng.choice(DESIGNATIONS),
+            rng.choice(DEPARTMENTS),
+            'Seed Bank',
+            f'{number:012d}',
+            'SEED0000001',
+            Decimal(rng.randrange(250, 1500) * 100),
+            now,
+            now,
+            rng.random() > 0.03,
+        )
+
+
+def seed_payroll(employees=1000, start=None, end=None, paid_until=None, seed=42,
+                 chunk_size=SEED_CHUNK_SIZE, method=None, log=None):
+    """
+    Generate linked employees, attendance, salaries, payments, transactions
+    and notifications for the months start..end (default: the 12 months up
+    to the current one).
+
+    Rows come from generators and are inserted chunk_size at a time, one
+    transaction per month, so memory does not grow with the number of
+    rows. Salaries of months up to paid_until are paid. Returns the table
+    writers, whose rows and rows_per_second describe each table.
+    """
+    today = timezone.localdate()
+    end = end or (today.year, today.month)
+    start = start or shift_month(*end, -11)
+    paid_until = paid_until or shift_month(*end, -1)
+    rng = random.Random(seed)
+    log = log or (lambda message: None)
+    method = method or insert_method()
+    now = timezone.now()
+    statuses, weights = zip(*ATTENDANCE_WEIGHTS)
+
+    def writer(model, *fields):
+        return TableWriter(model, fields, method, chunk_size)
+
+    employee_writer = writer(
+        Employee, 'employee_id', 'full_name', 'email', 'phone', 'address', 'date_of_joining',
+        'designation', 'department', 'bank_name', 'account_number', 'ifsc_code', 'base_salary',
+        'created_at', 'updated_at', 'is_active',
+    )
+    attendance_writer = writer(Attendance, 'employee', 'date', 'status', 'check_in', 'check_out', 'notes', 'created_at')
+    salary_writer = writer(
+        Salary, 'employee', 'month', 'year', 'base_salary', 'total_working_days', 'days_present',
+        'days_absent', 'days_on_leave', 'half_days', 'salary_per_day', 'calculated_amount',
+        'allowances', 'deductions', 'net_salary', 'is_paid', 'created_at', 'updated_at',
+    )
+    payment_writer = writer(
+        Payment, 'salary', 'payment_date', 'payment_method', 'transaction_id', 'notes', 'created_at',
+    )
+    transaction_writer = writer(
+        Transaction, 'employee', 'payment', 'amount', 'transaction_date', 'description', 'created_at',
+    )
+    notification_writer = writer(
+        Notification, 'employee', 'notification_type', 'title', 'message', 'is_read', 'created_at',
+    )
+
+    with transaction.atomic():
+        for row in _employee_rows(rng, employees, date(*start, 1), now):
+            employee_writer.add(row)
+        employee_writer.flush()
+    seeded = Employee.objects.filter(employee_id__startswith=SEED_EMPLOYEE_PREFIX)
+    staff = list(seeded.filter(is_active=True).order_by('pk').values_list('pk', 'base_salary'))
+    log(f"employees: {employee_writer.rows}")
+
+    # Attendance and salaries, a month at a time
+    for year, month in month_range(start, end):
+        days = [
+            date(year, month, day) for day in range(1, monthrange(year, month)[1] + 1)
+            if date(year, month, day).weekday() < 5
+        ]
+        paid = (year, month) <= paid_until
+        with transaction.atomic():
+            for employee_pk, base_salary in staff:
+                counts = dict.fromkeys(statuses, 0)
+                for day, status in zip(days, rng.choices(statuses, weights, k=len(days))):
+                    counts[status] += 1
+                    attendance_writer.add((
+                        employee_pk, day, status,
+                        dt_time(9, rng.randrange(0, 30)) if status != 'absent' else None,
+                        dt_time(17, rng.randrange(30, 60)) if status == 'present' else None,
+                        '', now,
+                    ))
+                salary = Salary(employee_id=employee_pk, month=month, year=year, base_salary=base_salary)
+                apply_attendance(salary, counts, monthrange(year, month)[1])
+                salary_writer.add((
+                    employee_pk, month, year, base_salary, salary.total_working_days,
+                    salary.days_present, salary.days_absent, salary.days_on_leave, salary.half_days,
+                    salary.salary_per_day, salary.calculated_amount, salary.allowances,
+                    salary.deductions, salary.net_salary, paid, now, now,
+                ))
+            attendance_writer.flush()
+            salary_writer.flush()
+        log(f"{year}-{month:02d}: {attendance_writer.rows} attendance, {salary_writer.rows} salaries")
+
+    # Payments for the paid salaries, then a transaction and notification per payment
+    paid_salaries = Salary.objects.filter(employee__in=seeded, is_paid=True)
+    with transaction.atomic():
+        for salary_pk, year, month in paid_salaries.values_list('pk', 'year', 'month').iterator(chunk_size):
+            payment_writer.add((
+                salary_pk, date(year, month, monthrange(year, month)[1]), rng.choice(PAYMENT_METHODS),
+                f'SEED-{salary_pk}', '', now,
+            ))
+        payment_writer.flush()
+    log(f"payments: {payment_writer.rows}")
+
+    payments = Payment.objects.filter(salary__in=paid_salaries).values_list(
+        'pk', 'payment_date', 'salary__employee_id', 'salary__net_salary', 'salary__year', 'salary__month',
+    )
+    with transaction.atomic():
+        for payment_pk, payment_date, employee_pk, amount, year, month in payments.iterator(chunk_size):
+            period = f"{date(year, month, 1):%B} {year}"
+            transaction_writer.add((
+                employee_pk, payment_pk, amount, payment_date, f"Salary payment for {period}", now,
+            ))
+            notification_writer.add((
+                employee_pk, 'salary_paid', 'Salary Paid',
+                f'Your salary for {period} has been processed. Amount: ₹{amount}',
+                (year, month) != paid_until, now,
+            ))
+        transaction_writer.flush()
+        notification_writer.flush()
+    log(f"transactions: {transaction_writer.rows}, notifications: {notification_writer.rows}")
+
+    # Raw inserts skip the signals that keep these in step
+    rebuild_summaries()
+    rebuild_search_index()
+    invalidate_dashboard()
+
+    return [employee_writer, attendance_writer, salary_writer, payment_writer, transaction_writer, notification_writer]
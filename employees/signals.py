@@ -0,0 +1,91 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Employee, Attendance, Salary, Payment, Notification
+from .summaries import adjust_summary
+from .dashboard import invalidate_dashboard
+from .search import index_employee, unindex_employee
+from .notify import adjust_unread, adjust_unread_for_employees, forget_unread
+from .pubsub import publish_notifications
+
+
+# Attendance monthly summaries
+@receiver(pre_save, sender=Attendance)
+def remember_previous_attendance(sender, instance, raw=False, **kwargs):
+    instance._previous_attendance = None
+    if instance.pk and not raw:
+        instance._previous_attendance = (
+            Attendance.objects.filter(pk=instance.pk)
+            .values_list('employee_id', 'date', 'status')
+            .first()
+        )
+
+
+@receiver(post_save, sender=Attendance)
+def update_summary_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    current = (instance.employee_id, instance.date, instance.status)
+    previous = getattr(instance, '_previous_attendance', None)
+    if previous == current:
+        return
+    if previous:
+        employee_id, day, status = previous
+        adjust_summary(employee_id, day.year, day.month, status, -1)
+    adjust_summary(instance.employee_id, instance.date.year, instance.date.month, instance.status, 1)
+
+
+@receiver(post_delete, sender=Attendance)
+def update_summary_on_delete(sender, instance, **kwargs):
+    adjust_summary(instance.employee_id, instance.date.year, instance.date.month, instance.status, -1)
+
+
+# Cached admin dashboard
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+@receiver(post_save, sender=Salary)
+@receiver(post_delete, sender=Salary)
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def invalidate_dashboard_cache(sender, **kwargs):
+    invalidate_dashboard()
+
+
+# Employee search index
+@receiver(post_save, sender=Employee)
+def update_search_index(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_employee(instance)
+
+
+@receiver(post_delete, sender=Employee)
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_employee(instance)
+
+
+# Cached unread notification counters and live notification streams
+@receiver(post_save, sender=Notification)
+def count_saved_notification(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        if not instance.is_read:
+            user_id = Employee.objects.filter(pk=instance.employee_id).values_list('user_id', flat=True).first()
+            adjust_unread({user_id: 1})
+            publish_notifications([(user_id, instance)])
+    else:
+        # is_read may have changed either way; recount on next read
+        forget_unread(Employee.objects.filter(pk=instance.employee_id).values_list('user_id', flat=True))
+
+
+@receiver(post_delete, sender=Notification)
+def count_deleted_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust_unread_for_employees({instance.employee_id: -1})
+
+
+@receiver(post_save, sender=Employee)
+def forget_unread_on_relink(sender, instance, raw=False, **kwargs):
+    # The counter is keyed by user, so linking an account changes what it counts
+    if not raw and instance.user_id:
+        forget_unread([instance.user_id])
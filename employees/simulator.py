@@ -0,0 +1,161 @@
+"""
+Payroll what-if projections.
+
+Active employees' base salaries and a year of monthly attendance are loaded
+into NumPy arrays once; each scenario then applies the calculation of
+Salary.calculate_salary() to all of them at the same time and never writes
+to the database. numpy and pandas are imported when data is loaded, so
+the rest of the app works without them.
+"""
+from calendar import monthrange
+
+from .models import Employee, AttendanceMonthlySummary
+
+
+MONTHS = range(1, 13)
+
+
+class PayrollData:
+    """Active employees and one year of their attendance, as arrays"""
+
+    def __init__(self, year, departments, department_codes, base_salary, days_present, half_days):
+        import numpy as np
+
+        self.year = year
+        self.departments = departments            # department names, sorted
+        self.department_codes = department_codes  # (employees,) index into departments
+        self.base_salary = base_salary            # (employees,)
+        self.days_present = days_present          # (employees, 12)
+        self.half_days = half_days                # (employees, 12)
+
+        # (department, month) cell of each employee-month, for one bincount per projection
+        self.cells = (department_codes[:, None] * 12 + np.arange(12)).ravel()
+        self.headcount = np.bincount(department_codes, minlength=len(departments))
+
+    def __len__(self):
+        return len(self.base_salary)
+
+
+class Scenario:
+    """
+    Changes to project: a raise for everyone (raise_pct) or per department
+    (department_raises, {name: pct}, replacing raise_pct there), extra
+    leave days per employee per year, and a monthly allowance or deduction
+    per employee.
+    """
+
+    def __init__(self, raise_pct=0, department_raises=None, extra_leave_days=0, allowance=0, deduction=0):
+        self.raise_pct = raise_pct
+        self.department_raises = department_raises or {}
+        self.extra_leave_days = extra_leave_days
+        self.allowance = allowance
+        self.deduction = deduction
+
+
+def _fill_unobserved(values, observed):
+    """Months without attendance take the mean of employees that have it"""
+    import numpy as np
+
+    counts = observed.sum(axis=0)
+    if not counts.any():
+        return None
+    month_means = np.where(counts > 0, (values * observed).sum(axis=0) / np.maximum(counts, 1), np.nan)
+    month_means = np.where(np.isnan(month_means), np.nanmean(month_means), month_means)
+    return np.where(observed, values, month_means)
+
+
+def load_payroll_data(year):
+    """
+    Load active employees and their monthly attendance of `year`.
+
+    Employees with no attendance in a month (joiners, gaps) are assumed to
+    attend like the average employee did that month.
+    """
+    import numpy as np
+
+    employees = list(
+        Employee.objects.filter(is_active=True).order_by('pk').values_list('pk', 'department', 'base_salary')
+    )
+    if not employees:
+        raise ValueError("There are no active employees to project")
+    pks = np.fromiter((row[0] for row in employees), dtype=np.int64, count=len(employees))
+    departments, department_codes = np.unique([row[1] for row in employees], return_inverse=True)
+    base_salary = np.fromiter((row[2] for row in employees), dtype=np.float64, count=len(employees))
+
+    summaries = np.array(
+        list(
+            AttendanceMonthlySummary.objects.filter(year=year, employee__is_active=True)
+            .values_list('employee_id', 'month', 'days_present', 'half_days')
+        ),
+        dtype=np.int64,
+    ).reshape(-1, 4)
+    rows = np.searchsorted(pks, summaries[:, 0])
+    columns = summaries[:, 1] - 1
+
+    shape = (len(pks), 12)
+    observed = np.zeros(shape, dtype=bool)
+    days_present = np.zeros(shape)
+    half_days = np.zeros(shape)
+    observed[rows, columns] = True
+    days_present[rows, columns] = summaries[:, 2]
+    half_days[rows, columns] = summaries[:, 3]
+
+    days_present = _fill_unobserved(days_present, observed)
+    if days_present is None:
+        raise ValueError(f"There is no attendance in {year} to project from")
+    half_days = _fill_unobserved(half_days, observed)
+
+    return PayrollData(year, [str(name) for name in departments], department_codes, base_salary, days_present, half_days)
+
+
+def project(data, scenario, year):
+    """
+    Monthly and annual payroll cost by department for `year` under
+    `scenario`, as a DataFrame with a column per month and an 'Annual'
+    column.
+    """
+    import numpy as np
+    import pandas as pd
+
+    unknown = set(scenario.department_raises) - set(data.departments)
+    if unknown:
+        raise ValueError(f"Unknown department(s): {', '.join(sorted(unknown))}")
+
+    raises = np.full(len(data.departments), scenario.raise_pct, dtype=np.float64)
+    for name, pct in scenario.department_raises.items():
+        raises[data.departments.index(name)] = pct
+    base_salary = data.base_salary * (1 + raises[data.department_codes] / 100)
+
+    # Salary.calculate_salary(): base / calendar days, paid for present days
+    # and half of half days. The division is done per department and month,
+    # after summing salary-weighted paid days, to keep the per-employee work small.
+    paid_days = data.days_present - scenario.extra_leave_days / 12
+    np.maximum(paid_days, 0, out=paid_days)
+    paid_days += data.half_days * 0.5
+    paid_days *= base_salary[:, None]
+    total_days = np.array([monthrange(year, month)[1] for month in MONTHS], dtype=np.float64)
+    by_department = np.bincount(
+        data.cells, weights=paid_days.ravel(), minlength=len(data.departments) * 12,
+    ).reshape(-1, 12) / total_days
+    by_department += (scenario.allowance - scenario.deduction) * data.headcount[:, None]
+
+    frame = pd.DataFrame(
+        by_department.round(2),
+        index=pd.Index(data.departments, name='department'),
+        columns=[f'{year}-{month:02d}' for month in MONTHS],
+    )
+    frame['Annual'] = by_department.sum(axis=1).round(2)
+    return frame
+
+
+def compare(data, scenario, year):
+    """Annual cost by department without and with the scenario, and the change"""
+    import pandas as pd
+
+    baseline = project(data, Scenario(), year)['Annual']
+    projected = project(data, scenario, year)['Annual']
+    frame = pd.DataFrame({'baseline': baseline, 'scenario': projected})
+    frame.loc['Total'] = frame.sum()
+    frame['change'] = frame['scenario'] - frame['baseline']
+    frame['change %'] = (frame['change'] / frame['baseline'] * 100).round(2)
+    return frame
@@ -0,0 +1,10 @@
+from django.conf import settings
+
+
+def tune_sqlite(sender, connection, **kwargs):
+    """connection_created receiver applying SQLITE_PRAGMAS to new SQLite connections"""
+    if connection.vendor != 'sqlite':
+        return
+    # On the driver's connection, so the PRAGMAs are not counted as queries
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f"PRAGMA {name} = {value}")
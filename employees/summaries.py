@@ -0,0 +1,109 @@
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from .models import Attendance, AttendanceMonthlySummary
+
+
+SUMMARY_BATCH_SIZE = 1000
+
+# Attendance status -> AttendanceMonthlySummary counter
+STATUS_FIELDS = {
+    'present': 'days_present',
+    'absent': 'days_absent',
+    'leave': 'days_on_leave',
+    'half_day': 'half_days',
+}
+
+
+def month_bounds(year, month):
+    return date(year, month, 1), date(year, month, monthrange(year, month)[1])
+
+
+def _status_counts():
+    return {
+        field: Count('pk', filter=Q(status=status))
+        for status, field in STATUS_FIELDS.items()
+    }
+
+
+def adjust_summary(employee_id, year, month, status, delta):
+    """Add delta to one status counter of an employee's monthly summary"""
+    field = STATUS_FIELDS.get(status)
+    if field is None:
+        return
+    summaries = AttendanceMonthlySummary.objects.filter(employee_id=employee_id, year=year, month=month)
+    if delta < 0:
+        # Never creates a row: while an employee is being deleted, the cascade
+        # removes their attendance, and a new summary would point at them
+        summaries.update(**{field: F(field) + delta})
+        return
+    summary, _ = AttendanceMonthlySummary.objects.get_or_create(
+        employee_id=employee_id, year=year, month=month
+    )
+    AttendanceMonthlySummary.objects.filter(pk=summary.pk).update(**{field: F(field) + delta})
+
+
+def refresh_summaries(keys):
+    """
+    Recount the summaries for the given (employee_id, year, month) keys
+    from raw attendance. Used by bulk writes that bypass model signals.
+    """
+    employees_by_month = defaultdict(set)
+    for employee_id, year, month in keys:
+        employees_by_month[(year, month)].add(employee_id)
+
+    for (year, month), employee_ids in employees_by_month.items():
+        start_date, end_date = month_bounds(year, month)
+        counts = {
+            row.pop('employee_id'): row
+            for row in Attendance.objects.filter(
+                employee_id__in=employee_ids, date__gte=start_date, date__lte=end_date
+            ).order_by().values('employee_id').annotate(**_status_counts())
+        }
+        AttendanceMonthlySummary.objects.bulk_create(
+            [
+                AttendanceMonthlySummary(
+                    employee_id=employee_id, year=year, month=month,
+                    **counts.get(employee_id, {}),
+                )
+                for employee_id in employee_ids
+            ],
+            update_conflicts=True,
+            unique_fields=['employee', 'year', 'month'],
+            update_fields=list(STATUS_FIELDS.values()) + ['updated_at'],
+        )
+
+
+def rebuild_summaries(year=None, batch_size=SUMMARY_BATCH_SIZE):
+    """Recreate the summary table (or one year of it) from raw attendance"""
+    attendances = Attendance.objects.all()
+    summaries = AttendanceMonthlySummary.objects.all()
+    if year is not None:
+        attendances = attendances.filter(date__year=year)
+        summaries = summaries.filter(year=year)
+
+    rows = (
+        attendances.order_by()
+        .annotate(year=ExtractYear('date'), month=ExtractMonth('date'))
+        .values('employee_id', 'year', 'month')
+        .annotate(**_status_counts())
+    )
+
+    written = 0
+    with transaction.atomic():
+        summaries.delete()
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(AttendanceMonthlySummary(**row))
+            if len(batch) >= batch_size:
+                AttendanceMonthlySummary.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        AttendanceMonthlySummary.objects.bulk_create(batch)
+        written += len(batch)
+    return written
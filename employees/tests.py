@@ -1,3 +1,633 @@
-from django.test import TestCase
+import base64
+import importlib.util
+import io
+import json
+import re
+import tempfile
+import zipfile
+from calendar import monthrange
+from datetime import date
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.db import IntegrityError, connection
+from django.http import HttpResponse
+from django.db.models import Count, Q, Sum
+from django.conf import settings
+from django.core.cache import cache
+from django.test.utils import CaptureQueriesContext
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from .analytics import period_filter
+from .models import User, Employee, Attendance, AttendanceMonthlySummary, Salary, Payment, Transaction, Notification, PayrollRun, Job
+from .exports import stream_xlsx
+from .metrics import MetricsMiddleware, Registry
+from .jobs import enqueue, execute_job, job_handler, run_worker
+from .imports import import_attendance_csv
+from .notify import mark_all_read, unread_count
+from .pubsub import notification_events
+from .pagination import keyset_paginate
+from .payslips import payslip_data, payslip_path
+from .payroll import pay_salaries, run_payroll
+from .summaries import refresh_summaries
+from .simulator import Scenario, load_payroll_data, project
+from .search import search_employees, search_filter
+from .routers import REPLICA_DATABASE, ReplicaRouter, RequestState, _request_state, use_replica
+
+
+def make_employee(number, **fields):
+    defaults = {
+        'employee_id': f'EMP{number:04d}', 'full_name': f'Employee {number}', 'email': f'employee{number}@example.com',
+        'phone': '9999999999', 'date_of_joining': date(2024, 1, 1), 'designation': 'Engineer',
+        'department': 'Engineering', 'bank_name': 'Bank', 'account_number': f'ACC{number:08d}',
+        'ifsc_code': 'BANK0000001', 'base_salary': Decimal('30000.00'),
+    }
+    return Employee.objects.create(**{**defaults, **fields})
+
+
+class QueryPlanTests(TestCase):
+    """
+    EXPLAIN the hot queries from views.py and fail if any of them reads a
+    table without an index (SQLite "SCAN <table>", PostgreSQL "Seq Scan").
+    Queries filtering on indexed columns must also look the rows up in the
+    index rather than scan all of it.
+    """
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            # Tiny test tables would otherwise always be sequentially scanned
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+        elif connection.vendor != 'sqlite':
+            self.skipTest(f"No query plan checks for {connection.vendor}")
+
+    def assertUsesIndex(self, queryset):
+        plan = queryset.explain()
+        table = re.escape(queryset.model._meta.db_table)
+        if connection.vendor == 'sqlite':
+            full_scan = re.search(rf'\bSCAN {table}\b(?! USING)', plan)
+        else:
+            full_scan = re.search(rf'Seq Scan on {table}\b', plan)
+        self.assertIsNone(full_scan, f"Full table scan in plan:\n{plan}")
+
+    def assertSearchesIndex(self, queryset):
+        """Stricter: the filter itself must be answered from an index, not by scanning one"""
+        self.assertUsesIndex(queryset)
+        plan = queryset.explain()
+        table = re.escape(queryset.model._meta.db_table)
+        if connection.vendor == 'sqlite':
+            self.assertRegex(plan, rf'\bSEARCH {table} USING (?:COVERING )?INDEX\b', f"No index search in plan:\n{plan}")
+        else:
+            self.assertIn('Index Cond', plan, f"No index search in plan:\n{plan}")
+
+    # Dashboard
+    def test_active_employee_count(self):
+        self.assertUsesIndex(Employee.objects.filter(is_active=True).order_by())
+
+    def test_employee_profile_link_by_email(self):
+        self.assertUsesIndex(Employee.objects.filter(email='someone@example.com'))
+
+    def test_paid_and_unpaid_totals(self):
+        self.assertUsesIndex(Salary.objects.filter(is_paid=True).order_by())
+        self.assertUsesIndex(Salary.objects.filter(is_paid=False).order_by())
+
+    def test_monthly_totals(self):
+        self.assertSearchesIndex(
+            Salary.objects.filter(period_filter((2024, 11), (2025, 4)))
+            .order_by().values('year', 'month')
+            .annotate(paid=Sum('net_salary', filter=Q(is_paid=True)), employees=Count('employee', distinct=True))
+        )
+
+    def test_recent_payments(self):
+        self.assertUsesIndex(Payment.objects.all()[:10])
+
+    def test_employee_salaries_and_unread_notifications(self):
+        self.assertSearchesIndex(Salary.objects.filter(employee_id=1).order_by('-year', '-month')[:5])
+        self.assertSearchesIndex(Notification.objects.filter(employee_id=1, is_read=False)[:5])
+
+    # Listings (keyset pages)
+    def test_employee_list(self):
+        self.assertUsesIndex(Employee.objects.order_by('-created_at', '-pk')[:51])
+
+    def test_attendance_list(self):
+        self.assertUsesIndex(Attendance.objects.order_by('-date', '-pk')[:51])
+
+    def test_salary_list(self):
+        self.assertUsesIndex(Salary.objects.order_by('-year', '-month', '-pk')[:51])
+
+    def test_transaction_history(self):
+        self.assertUsesIndex(Transaction.objects.order_by('-transaction_date', '-pk')[:51])
+        self.assertSearchesIndex(Transaction.objects.filter(employee_id=1).order_by('-transaction_date', '-pk')[:51])
+
+    def test_notifications(self):
+        self.assertUsesIndex(Notification.objects.order_by('-created_at', '-pk')[:51])
+        self.assertSearchesIndex(Notification.objects.filter(employee_id=1).order_by('-created_at', '-pk')[:51])
+
+    # Reports, payroll and bulk payment
+    def test_monthly_report(self):
+        self.assertSearchesIndex(Salary.objects.filter(month=10, year=2025))
+        self.assertSearchesIndex(AttendanceMonthlySummary.objects.filter(month=10, year=2025))
+
+    def test_annual_report(self):
+        self.assertSearchesIndex(Salary.objects.filter(year=2025, is_paid=True))
+
+    def test_unpaid_salaries_for_month(self):
+        self.assertSearchesIndex(Salary.objects.filter(month=10, year=2025, is_paid=False))
+
+    def test_payroll_salaries_for_employees(self):
+        self.assertSearchesIndex(Salary.objects.filter(month=10, year=2025, employee_id__in=[1, 2, 3]))
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    """Which database ReplicaRouter picks; tests themselves run without a replica"""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.state = RequestState()
+        token = _request_state.set(self.state)
+        self.addCleanup(_request_state.reset, token)
+
+    def test_reads_use_primary_by_default(self):
+        self.assertIsNone(self.router.db_for_read(Salary))
+
+    def test_reads_in_use_replica_use_replica(self):
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Salary), REPLICA_DATABASE)
+
+    def test_write_pins_request_to_primary(self):
+        with use_replica():
+            self.assertEqual(self.router.db_for_write(Payment), 'default')
+            self.assertIsNone(self.router.db_for_read(Salary))
+        self.assertTrue(self.state.wrote)
+
+    def test_pinned_request_reads_primary(self):
+        self.state.pinned = True
+        with use_replica():
+            self.assertIsNone(self.router.db_for_read(Salary))
+
+    def test_replica_is_never_migrated(self):
+        self.assertIs(self.router.allow_migrate(REPLICA_DATABASE, 'employees'), False)
+        self.assertIsNone(self.router.allow_migrate('default', 'employees'))
+
+
+class PayrollRunTests(TestCase):
+    def setUp(self):
+        for number in range(3):
+            make_employee(number)
+
+    def test_run_completes(self):
+        run = run_payroll(10, 2025, chunk_size=2)
+        self.assertEqual((run.status, run.employees_processed, run.salaries_created), ('completed', 3, 3))
+
+    def test_only_one_run_in_progress_per_month(self):
+        PayrollRun.objects.create(month=10, year=2025)
+        with self.assertRaises(IntegrityError):
+            PayrollRun.objects.create(month=10, year=2025)
+
+    def test_resume_joins_run_in_progress(self):
+        interrupted = PayrollRun.objects.create(month=10, year=2025)
+        self.assertEqual(run_payroll(10, 2025).pk, interrupted.pk)
+
+    def test_restart_fails_run_in_progress(self):
+        interrupted = PayrollRun.objects.create(month=10, year=2025)
+        run = run_payroll(10, 2025, restart=True)
+        interrupted.refresh_from_db()
+        self.assertEqual(interrupted.status, 'failed')
+        self.assertNotEqual(run.pk, interrupted.pk)
+        self.assertEqual(run.status, 'completed')
+
+
+class PaySalariesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('employee', password='employee')
+        self.salaries = [
+            Salary.objects.create(
+                employee=make_employee(number, user=self.user if number == 1 else None),
+                month=10, year=2025, base_salary=Decimal('30000.00'), net_salary=Decimal('30000.00'),
+            )
+            for number in range(1, 4)
+        ]
+        self.uncalculated = Salary.objects.create(
+            employee=make_employee(4), month=10, year=2025, base_salary=Decimal('30000.00'),
+        )
+
+    def pay(self, salary_ids):
+        with self.captureOnCommitCallbacks(execute=True):
+            return pay_salaries(salary_ids, date(2025, 10, 31), 'bank_transfer', transaction_prefix='OCT')
+
+    def test_pays_each_salary_once(self):
+        ids = [salary.pk for salary in self.salaries]
+        results = self.pay(ids)
+
+        self.assertTrue(all(result['success'] for result in results))
+        self.assertEqual(Salary.objects.filter(pk__in=ids, is_paid=True).count(), 3)
+        for model in (Payment, Transaction, Notification):
+            self.assertEqual(model.objects.count(), 3, model.__name__)
+        self.assertEqual(
+            sorted(Payment.objects.values_list('transaction_id', flat=True)), sorted(f'OCT-{pk}' for pk in ids),
+        )
+        self.assertEqual(
+            list(Transaction.objects.order_by('employee_id').values_list('amount', flat=True)), [Decimal('30000.00')] * 3,
+        )
+        self.assertEqual(unread_count(self.user.pk), 1)
+
+    def test_reports_unpayable_salaries(self):
+        self.pay([self.salaries[0].pk])
+        results = {result['salary_id']: result for result in self.pay([self.salaries[0].pk, self.uncalculated.pk, 0])}
+
+        self.assertEqual(results[self.salaries[0].pk]['message'], 'Already paid')
+        self.assertEqual(results[self.uncalculated.pk]['message'], 'Net salary has not been calculated')
+        self.assertEqual(results[0]['message'], 'Salary not found')
+        self.assertFalse(any(result['success'] for result in results.values()))
+        self.uncalculated.refresh_from_db()
+        self.assertFalse(self.uncalculated.is_paid)
+
+    def test_second_call_pays_nothing_twice(self):
+        ids = [salary.pk for salary in self.salaries]
+        self.pay(ids)
+        results = self.pay(ids + ids)
+
+        self.assertEqual([result['message'] for result in results], ['Already paid'] * 3)
+        for model in (Payment, Transaction, Notification):
+            self.assertEqual(model.objects.count(), 3, model.__name__)
+
+class AttendanceSummaryTests(TestCase):
+    def setUp(self):
+        self.employee = make_employee(1)
+
+    def summary(self, month=10):
+        return AttendanceMonthlySummary.objects.filter(employee=self.employee, year=2025, month=month).values_list(
+            'days_present', 'days_absent', 'days_on_leave', 'half_days',
+        ).first()
+
+    def test_follows_attendance_changes(self):
+        attendance = Attendance.objects.create(employee=self.employee, date=date(2025, 10, 1), status='present')
+        Attendance.objects.create(employee=self.employee, date=date(2025, 10, 2), status='leave')
+        self.assertEqual(self.summary(), (1, 0, 1, 0))
+
+        attendance.status = 'half_day'
+        attendance.save()
+        self.assertEqual(self.summary(), (0, 0, 1, 1))
+
+        attendance.date = date(2025, 11, 3)
+        attendance.save()
+        self.assertEqual(self.summary(), (0, 0, 1, 0))
+        self.assertEqual(self.summary(month=11), (0, 0, 0, 1))
+
+        attendance.delete()
+        self.assertEqual(self.summary(month=11), (0, 0, 0, 0))
+
+    def test_deleting_employee_with_attendance(self):
+        Attendance.objects.create(employee=self.employee, date=date(2025, 10, 1), status='present')
+        self.employee.delete()
+        self.assertFalse(AttendanceMonthlySummary.objects.exists())
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_refresh_after_bulk_write(self):
+        Attendance.objects.bulk_create([
+            Attendance(employee=self.employee, date=date(2025, 10, day), status=status)
+            for day, status in ((1, 'present'), (2, 'present'), (3, 'absent'))
+        ])
+        self.assertIsNone(self.summary())
+        refresh_summaries({(self.employee.pk, 2025, 10)})
+        self.assertEqual(self.summary(), (2, 1, 0, 0))
+
+class AttendanceImportTests(TestCase):
+    def setUp(self):
+        make_employee(1)
+
+    def test_rows_are_upserted_and_bad_rows_rejected(self):
+        result = import_attendance_csv([
+            'employee_id,date,status\n', 'EMP0001,2025-10-01,present\n', 'EMP0001,2025-10-02,sick\n',
+        ])
+        self.assertEqual((result.imported, result.rejected_count), (1, 1))
+
+    def test_unreadable_file_imports_nothing(self):
+        def lines():
+            yield 'employee_id,date,status\n'
+            yield 'EMP0001,2025-10-01,present\n'
+            yield b'EMP0001,2025-10-02,\xff\n'.decode('utf-8')
+
+        with self.assertRaises(UnicodeDecodeError):
+            import_attendance_csv(lines(), batch_size=1)
+        self.assertFalse(Attendance.objects.exists())
+        self.assertFalse(AttendanceMonthlySummary.objects.exists())
+
+
+class KeysetPaginationTests(TestCase):
+    ordering = ['-date', '-pk']
+
+    @classmethod
+    def setUpTestData(cls):
+        # Several rows share each date, so pages split ties on the sort key
+        employees = [make_employee(number) for number in range(3)]
+        for day in range(1, 5):
+            for employee in employees:
+                Attendance.objects.create(employee=employee, date=date(2025, 10, day))
+        cls.expected = list(Attendance.objects.order_by(*cls.ordering).values_list('pk', flat=True))
+
+    def page(self, **params):
+        request = RequestFactory().get('/attendance/', params)
+        return keyset_paginate(request, Attendance.objects.all(), self.ordering)
+
+    def ids(self, page):
+        return [attendance.pk for attendance in page]
+
+    def test_next_and_previous_cursors_walk_every_row_once(self):
+        pages = [self.page(page_size=5)]
+        self.assertFalse(pages[0].has_previous)
+        while pages[-1].has_next:
+            pages.append(self.page(page_size=5, after=pages[-1].next_cursor))
+        self.assertEqual([pk for page in pages for pk in self.ids(page)], self.expected)
+        self.assertEqual([len(page) for page in pages], [5, 5, 2])
+
+        # And back again with ?before=
+        back = [pages[-1]]
+        while back[-1].has_previous:
+            back.append(self.page(page_size=5, before=back[-1].previous_cursor))
+        self.assertEqual([self.ids(page) for page in back], [self.ids(page) for page in reversed(pages)])
+        self.assertTrue(back[1].has_next)
+
+    def test_query_strings_keep_other_parameters(self):
+        page = self.page(page_size=5, status='present')
+        self.assertEqual(page.next_query, f'page_size=5&status=present&after={page.next_cursor}')
+        self.assertEqual(page.first_query, 'page_size=5&status=present')
+
+    def test_invalid_cursors_start_from_the_first_page(self):
+        def cursor(values):
+            return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+        for bad in ('not-a-cursor!', cursor(['2025-10-01']), cursor(['yesterday', 1]),
+                    cursor([{'date': 1}, 1]), cursor(['2025-10-01', None])):
+            self.assertEqual(self.ids(self.page(page_size=5, after=bad)), self.expected[:5], bad)
+            self.assertEqual(self.ids(self.page(page_size=5, before=bad)), self.expected[:5], bad)
+
+    @override_settings(PAGE_SIZE=4, MAX_PAGE_SIZE=6)
+    def test_page_size_is_clamped(self):
+        for page_size, expected in (('0', 1), ('-3', 1), ('100', 6), ('abc', 4), (None, 4)):
+            params = {} if page_size is None else {'page_size': page_size}
+            self.assertEqual(len(self.page(**params)), expected, page_size)
+
+class EmployeeSearchTests(TestCase):
+    def setUp(self):
+        make_employee(3, full_name='Priya Sharma')
+        make_employee(17, full_name='Rahul Verma')
+        self.client.force_login(User.objects.create_user('admin', password='admin', role='admin'))
+
+    def search(self, term):
+        return sorted(Employee.objects.filter(search_filter(term)).values_list('full_name', flat=True))
+
+    def test_matches_inside_words(self):
+        self.assertEqual(self.search('harma'), ['Priya Sharma'])
+        self.assertEqual(self.search('0003'), ['Priya Sharma'])
+        self.assertEqual(self.search('EXAMPLE.COM'), ['Priya Sharma', 'Rahul Verma'])
+        self.assertEqual([row['full_name'] for row in search_employees('harma')], ['Priya Sharma'])
+
+    def test_short_terms(self):
+        self.assertEqual(self.search('ma'), ['Priya Sharma', 'Rahul Verma'])
+        self.assertEqual(self.search('17'), ['Rahul Verma'])
+
+    def test_limit_is_bounded(self):
+        for limit, expected in (('-1', 1), ('0', 1), ('abc', 2), ('1000', 2)):
+            response = self.client.get(reverse('employee_search'), {'q': 'example', 'limit': limit})
+            self.assertEqual(len(response.json()['results']), expected, limit)
+
+
+class XlsxExportTests(SimpleTestCase):
+    def test_empty_cells_keep_their_column(self):
+        workbook = zipfile.ZipFile(io.BytesIO(b''.join(stream_xlsx(['A', 'B', 'C'], [['x', None, 3]]))))
+        sheet = workbook.read('xl/worksheets/sheet1.xml').decode()
+        self.assertIn('<row><c t="inlineStr"><is><t xml:space="preserve">x</t></is></c><c/><c><v>3</v></c></row>', sheet)
+
+
+class PayslipCacheTests(TestCase):
+    def setUp(self):
+        self.employee = make_employee(1)
+        self.salary = Salary.objects.create(employee=self.employee, month=10, year=2025, base_salary=Decimal('30000.00'))
+
+    def path(self):
+        return payslip_path(payslip_data(Salary.objects.filter(pk=self.salary.pk))[0])
+
+    def test_cached_outside_media_root(self):
+        path = self.path()
+        self.assertTrue(path.is_relative_to(settings.PRIVATE_MEDIA_ROOT))
+        self.assertFalse(path.is_relative_to(settings.MEDIA_ROOT))
+
+    def test_employee_change_invalidates_cached_slip(self):
+        before = self.path()
+        self.employee.account_number = 'ACC99999999'
+        self.employee.save()
+        self.assertNotEqual(self.path(), before)
+
+
+@job_handler('tests.succeed')
+def _succeeding_job(job):
+    return {'ok': True}
+
+
+@job_handler('tests.unserializable_result')
+def _unserializable_job(job):
+    # Fails when the result is saved, after the handler returned
+    return {'when': object()}
+
+
+class JobTests(TransactionTestCase):
+    def setUp(self):
+        private_root = tempfile.TemporaryDirectory()
+        self.addCleanup(private_root.cleanup)
+        self.enterContext(override_settings(PRIVATE_MEDIA_ROOT=private_root.name))
+        self.admin = User.objects.create_user('admin', password='admin', role='admin')
+
+    def test_worker_survives_job_failing_outside_handler(self):
+        failing = enqueue('tests.unserializable_result', max_attempts=1)
+        succeeding = enqueue('tests.succeed')
+        messages = []
+        run_worker(workers=1, burst=True, log=messages.append)
+
+        failing.refresh_from_db()
+        succeeding.refresh_from_db()
+        self.assertEqual(failing.status, 'failed')
+        self.assertIn('TypeError', failing.error)
+        self.assertEqual(succeeding.status, 'succeeded')
+        self.assertTrue(any('errored outside its handler' in message for message in messages))
+
+    def test_late_finish_does_not_overwrite_reclaimed_job(self):
+        job = enqueue('tests.succeed')
+        # Requeued as stale and claimed by another worker in the meantime
+        Job.objects.filter(pk=job.pk).update(status='running', locked_by='other-worker', attempts=2)
+        self.assertIsNone(execute_job(job.pk, 'first-worker'))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), ('running', 'other-worker'))
+
+    def test_exports_are_private(self):
+        job = enqueue('reports.export', {'export_format': 'csv', 'report_type': 'annual', 'year': 2025}, user=self.admin)
+        run_worker(workers=1, burst=True)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded')
+        url = reverse('job_download', args=[job.pk])
+
+        self.assertFalse((settings.MEDIA_ROOT / job.result['file']).exists())
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(User.objects.create_user('employee', password='employee', role='employee'))
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(self.admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'Employee ID,'))
+
+
+class UnreadCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('employee', password='employee')
+        self.employee = make_employee(1, user=self.user)
+        self.other = make_employee(2)
+        for employee in (self.employee, self.employee, self.other):
+            Notification.objects.create(employee=employee, notification_type='salary_paid', title='Paid', message='Paid')
+
+    def test_mark_all_read_resets_cached_count(self):
+        self.assertEqual(unread_count(self.user.pk), 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(mark_all_read(self.employee), 2)
+        self.assertEqual(unread_count(self.user.pk), 0)
+        self.assertTrue(Notification.objects.filter(employee=self.other, is_read=False).exists())
+
+    def test_admin_mark_all_read_leaves_employees_notifications(self):
+        self.client.force_login(User.objects.create_user('admin', password='admin', role='admin'))
+        self.client.post(reverse('notification_mark_all_read'))
+        self.assertEqual(Notification.objects.filter(is_read=False).count(), 3)
+
+
+class NotificationStreamTests(TransactionTestCase):
+    @override_settings(NOTIFICATION_STREAM_HEARTBEAT=0.01)
+    def test_idle_stream_holds_no_database_connection(self):
+        user = User.objects.create_user('employee', password='employee')
+        employee = make_employee(1, user=user)
+        notification = Notification.objects.create(
+            employee=employee, notification_type='salary_paid', title='Paid', message='Paid',
+        )
+
+        async def open_stream():
+            # Thread-sensitive code runs on this test's thread, as on a request's thread under ASGI
+            events = notification_events(user.pk, employee.pk, last_id=0)
+            try:
+                return [await anext(events) for _ in range(3)]
+            finally:
+                await events.aclose()
+
+        # The in-memory test database ignores close(), so record the calls instead
+        calls = []
+
+        def record_query(execute, sql, params, many, context):
+            calls.append('query')
+            return execute(sql, params, many, context)
+
+        close = connection.close
+        with connection.execute_wrapper(record_query), \
+                mock.patch.object(connection, 'close', side_effect=lambda: (calls.append('close'), close())):
+            received = async_to_sync(open_stream)()
+        self.assertTrue(received[1].startswith(f'id: {notification.pk}\n'))
+        self.assertEqual(received[2], ': keep-alive\n\n')
+        self.assertEqual(calls, ['query', 'close'])
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        # A registry of this test's requests only
+        self.registry = Registry()
+        for target in ('employees.metrics.registry', 'employees.views.registry'):
+            patcher = mock.patch(target, self.registry)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for number in range(3):
+            make_employee(number)
+        self.client.force_login(User.objects.create_user('admin', password='admin', role='admin'))
+
+    def metric(self, name, view):
+        response = self.client.get(reverse('metrics'))
+        match = re.search(rf'^{name}\{{view="{view}",method="GET"\}} (\S+)$', response.content.decode(), re.M)
+        return match and float(match[1])
+
+    def test_reports_query_count_per_view(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('employee_list'))
+        # Read before the next request resets the query log
+        query_count = len(queries)
+        self.assertEqual(self.metric('payease_db_queries_per_request_sum', 'employee_list'), query_count)
+        self.assertEqual(self.metric('payease_db_queries_per_request_count', 'employee_list'), 1)
+        self.assertIsNone(self.metric('payease_n_plus_one_requests_total', 'employee_list'))
+
+    @override_settings(METRICS_N_PLUS_ONE_THRESHOLD=3)
+    def test_flags_repeated_sql(self):
+        def lazy_loop(request):
+            for employee in Employee.objects.all():
+                Employee.objects.filter(pk=employee.pk).exists()
+            return HttpResponse()
+
+        request = RequestFactory().get('/loop/')
+        request.resolver_match = mock.Mock(view_name='lazy_loop')
+        with self.assertLogs('employees.metrics', 'WARNING') as logs:
+            MetricsMiddleware(lazy_loop)(request)
+        self.assertIn('Possible N+1 in lazy_loop: 3 x', logs.output[0])
+        self.assertEqual(self.metric('payease_db_queries_per_request_sum', 'lazy_loop'), 4)
+        self.assertEqual(self.metric('payease_n_plus_one_requests_total', 'lazy_loop'), 1)
+
+@skipUnless(
+    importlib.util.find_spec('numpy') and importlib.util.find_spec('pandas'), "numpy and pandas are not installed",
+)
+class SimulatorTests(TestCase):
+    def test_unchanged_scenario_matches_calculate_salary(self):
+        employees = [
+            make_employee(1, base_salary=Decimal('30000.00')),
+            make_employee(2, base_salary=Decimal('45500.50')),
+            make_employee(3, department='Sales', base_salary=Decimal('28000.00')),
+        ]
+        expected = {}
+        for employee in employees:
+            for month in range(1, 13):
+                days_present, half_days = 15 + (employee.pk + month) % 10, (employee.pk * month) % 3
+                AttendanceMonthlySummary.objects.update_or_create(
+                    employee=employee, year=2024, month=month,
+                    defaults={'days_present': days_present, 'half_days': half_days},
+                )
+                salary = Salary(
+                    base_salary=employee.base_salary, total_working_days=monthrange(2024, month)[1],
+                    days_present=days_present, half_days=half_days,
+                    allowances=Decimal('0.00'), deductions=Decimal('0.00'),
+                )
+                key = (employee.department, f'2024-{month:02d}')
+                expected[key] = expected.get(key, Decimal('0')) + salary.calculate_salary()
+
+        frame = project(load_payroll_data(2024), Scenario(), 2024)
+        self.assertEqual(list(frame.index), ['Engineering', 'Sales'])
+        for (department, month), amount in expected.items():
+            self.assertAlmostEqual(frame.loc[department, month], float(amount), places=2)
+        for department in frame.index:
+            annual = sum(amount for (name, _), amount in expected.items() if name == department)
+            self.assertAlmostEqual(frame.loc[department, 'Annual'], float(annual), places=2)
+
+class HomePageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('payroll-admin', password='admin', role='admin')
+
+    def test_anonymous_page_never_shows_another_users_data(self):
+        self.client.force_login(self.user)
+        self.assertContains(self.client.get(reverse('home')), 'payroll-admin')
+
+        response = self.client_class().get(reverse('home'))
+        self.assertNotContains(response, 'payroll-admin')
+        self.assertNotContains(response, 'csrfmiddlewaretoken')
+
+    def test_logged_in_user_is_not_served_the_anonymous_page(self):
+        self.client_class().get(reverse('home'))
+        self.client.force_login(self.user)
+        self.assertContains(self.client.get(reverse('home')), 'payroll-admin')
+
+    def test_anonymous_page_is_cached_but_not_by_browsers(self):
+        self.client.get(reverse('home'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('home'))
+        self.assertIn('no-store', response['Cache-Control'])
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from django.contrib.auth import views as auth_views
 from . import views
@@ -12,11 +13,12 @@ urlpatterns = [
     path('logout/', auth_views.LogoutView.as_view(), name='logout'),
 
     # Dashboard
-    path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/', views.dashboard_async if settings.ASYNC_VIEWS else views.dashboard, name='dashboard'),
 
     # Employee Management
     path('employees/', views.employee_list, name='employee_list'),
     path('employees/create/', views.employee_create, name='employee_create'),
+    path('employees/search/', views.employee_search, name='employee_search'),
     path('employees/<int:pk>/', views.employee_detail, name='employee_detail'),
     path('employees/<int:pk>/edit/', views.employee_edit, name='employee_edit'),
     path('employees/<int:pk>/delete/', views.employee_delete, name='employee_delete'),
@@ -24,14 +26,18 @@ urlpatterns = [
     # Attendance
     path('attendance/', views.attendance_list, name='attendance_list'),
     path('attendance/create/', views.attendance_create, name='attendance_create'),
+    path('attendance/import/', views.attendance_import, name='attendance_import'),
     
     # Salary
     path('salaries/', views.salary_list, name='salary_list'),
     path('salaries/create/', views.salary_create, name='salary_create'),
+    path('salaries/payroll-run/', views.payroll_run, name='payroll_run'),
     path('salaries/<int:pk>/', views.salary_detail, name='salary_detail'),
+    path('salaries/<int:pk>/payslip/', views.salary_payslip, name='salary_payslip'),
     path('salaries/<int:pk>/calculate/', views.salary_calculate, name='salary_calculate'),  # Accepts both GET and POST
     
     # Payment
+    path('salaries/payments/bulk/', views.payment_bulk, name='payment_bulk'),
     path('salaries/<int:salary_id>/payment/', views.payment_process, name='payment_process'),
     path('salaries/<int:salary_id>/mark-unpaid/', views.payment_mark_unpaid, name='payment_mark_unpaid'),
     
@@ -40,11 +46,23 @@ urlpatterns = [
     path('transactions/<int:employee_id>/', views.transaction_history, name='transaction_history_employee'),
     
     # Reports
-    path('reports/', views.reports, name='reports'),
+    path('reports/', views.reports_async if settings.ASYNC_VIEWS else views.reports, name='reports'),
+    
+    # Background jobs
+    path('jobs/', views.job_list, name='job_list'),
+    path('jobs/<int:pk>/', views.job_detail, name='job_detail'),
+    path('jobs/<int:pk>/status/', views.job_status, name='job_status'),
+    path('jobs/<int:pk>/download/', views.job_download, name='job_download'),
     
     # Notifications
     path('notifications/', views.notifications, name='notifications'),
     path('notifications/<int:notification_id>/read/', views.notification_mark_read, name='notification_mark_read'),
+    path('notifications/read-all/', views.notification_mark_all_read, name='notification_mark_all_read'),
+    path('notifications/stream/', views.notification_stream, name='notification_stream'),
+    path('notifications/broadcast/', views.notification_broadcast, name='notification_broadcast'),
+    
+    # Metrics
+    path('metrics/', views.metrics, name='metrics'),
 ]
 
 
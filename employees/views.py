@@ -1,22 +1,68 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
+from asgiref.sync import sync_to_async
 from django.contrib.auth import login, authenticate
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.messages import get_messages
 from django.db.models import Sum, Count, Q
 from django.utils import timezone
+from django.utils.cache import add_never_cache_headers
+from django.views.decorators.cache import cache_page
 from datetime import datetime, timedelta
+from functools import wraps
 from calendar import monthrange
+from pathlib import Path
 import calendar
-
-from .models import User, Employee, Attendance, Salary, Payment, Transaction, Notification
-from .forms import UserRegistrationForm, EmployeeForm, AttendanceForm, SalaryForm, PaymentForm
+import csv
+
+from .models import User, Employee, Attendance, Salary, Payment, Transaction, Notification, PayrollRun, Job
+from .forms import UserRegistrationForm, EmployeeForm, AttendanceForm, SalaryForm, PaymentForm, PayrollRunForm, BulkPaymentForm, AttendanceImportForm, NotificationBroadcastForm
+from .imports import import_attendance_csv
+from .aio import gather_queries, run_in_thread
+from .dashboard import admin_dashboard_stats, aadmin_dashboard_stats, dashboard_version, adashboard_version
+from .analytics import monthly_total_rows, annual_breakdown, annual_pivot, attendance_totals
+from .exports import report_export_response
+from .payslips import get_payslip
+from .jobs import enqueue
+from .notify import mark_read, mark_all_read, broadcast
+from .pubsub import notification_events
+from .pagination import keyset_paginate
+from .metrics import registry
+from .routers import read_from_replica
+from .search import search_filter, search_employees, SEARCH_RESULT_LIMIT, MAX_SEARCH_RESULT_LIMIT
+from .payroll import attendance_counts, apply_attendance, run_payroll, pay_salaries
 
 
 def is_admin(user):
     return user.is_authenticated and user.is_admin_user()
 
 
+def cache_page_for_anonymous(timeout):
+    """
+    cache_page for visitors who are not logged in and have no pending
+    messages; anyone else gets the page rendered for them, since it shows
+    their username and logout form. Browsers are told not to keep the page,
+    which changes when they log in.
+    """
+    def decorator(view):
+        cached_view = cache_page(timeout)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.user.is_authenticated or get_messages(request):
+                return view(request, *args, **kwargs)
+            response = cached_view(request, *args, **kwargs)
+            add_never_cache_headers(response)
+            return response
+        return wrapper
+    return decorator
+
+
 # Public Views
+@cache_page_for_anonymous(settings.HOME_CACHE_TIMEOUT)
 def home(request):
     features = [
         {
@@ -97,46 +143,7 @@ def dashboard(request):
     
     if user.is_admin_user():
         # Admin Dashboard
-        total_employees = Employee.objects.filter(is_active=True).count()
-        total_salaries = Salary.objects.filter(is_paid=True).aggregate(
-            total=Sum('net_salary')
-        )['total'] or 0
-        unpaid_salaries = Salary.objects.filter(is_paid=False).aggregate(
-            total=Sum('net_salary')
-        )['total'] or 0
-        
-        # Monthly statistics
-        current_month = timezone.now().month
-        current_year = timezone.now().year
-        monthly_paid = Salary.objects.filter(
-            is_paid=True, month=current_month, year=current_year
-        ).aggregate(total=Sum('net_salary'))['total'] or 0
-        
-        # Recent payments
-        recent_payments = Payment.objects.all()[:10]
-        
-        # Chart data - Last 6 months
-        months_data = []
-        salary_data = []
-        for i in range(5, -1, -1):
-            date = timezone.now() - timedelta(days=30*i)
-            month = date.month
-            year = date.year
-            total = Salary.objects.filter(
-                is_paid=True, month=month, year=year
-            ).aggregate(total=Sum('net_salary'))['total'] or 0
-            months_data.append(calendar.month_abbr[month])
-            salary_data.append(float(total))
-        
-        context = {
-            'total_employees': total_employees,
-            'total_salaries': total_salaries,
-            'unpaid_salaries': unpaid_salaries,
-            'monthly_paid': monthly_paid,
-            'recent_payments': recent_payments,
-            'months_data': months_data,
-            'salary_data': salary_data,
-        }
+        context = admin_dashboard_stats()
     else:
         # Employee Dashboard
         try:
@@ -150,6 +157,7 @@ def dashboard(request):
                 'employee_salaries': employee_salaries,
                 'unpaid_count': unpaid_count,
                 'notifications': notifications,
+                'dashboard_version': dashboard_version(),
             }
         except Employee.DoesNotExist:
             # Employee logged in but no profile linked yet
@@ -181,11 +189,42 @@ def dashboard(request):
                     'employee_salaries': employee_salaries,
                     'unpaid_count': unpaid_count,
                     'notifications': notifications,
+                    'dashboard_version': dashboard_version(),
                 }
     
     return render(request, 'employees/dashboard.html', context)
 
 
+@login_required
+async def dashboard_async(request):
+    """dashboard with its independent queries running concurrently (for asgi.py)"""
+    user = await request.auser()
+    
+    if user.is_admin_user():
+        context = await aadmin_dashboard_stats()
+    else:
+        employee = await Employee.objects.filter(user=user).afirst()
+        if employee is None:
+            # Profile linking writes and sets messages; leave it to the sync view
+            return await sync_to_async(dashboard)(request)
+        
+        employee_salaries, unpaid_count, notifications = await gather_queries(
+            lambda: list(Salary.objects.filter(employee=employee).order_by('-year', '-month')[:5]),
+            lambda: Salary.objects.filter(employee=employee, is_paid=False).count(),
+            lambda: list(Notification.objects.filter(employee=employee, is_read=False)[:5]),
+        )
+        context = {
+            'employee': employee,
+            'employee_salaries': employee_salaries,
+            'unpaid_count': unpaid_count,
+            'notifications': notifications,
+            'dashboard_version': await adashboard_version(),
+        }
+    
+    request.user = user
+    return await sync_to_async(render)(request, 'employees/dashboard.html', context)
+
+
 # Employee Management Views
 @login_required
 @user_passes_test(is_admin)
@@ -193,14 +232,23 @@ def employee_list(request):
     employees = Employee.objects.all()
     search = request.GET.get('search', '')
     if search:
-        employees = employees.filter(
-            Q(full_name__icontains=search) |
-            Q(employee_id__icontains=search) |
-            Q(email__icontains=search)
-        )
-    return render(request, 'employees/employee_list.html', {'employees': employees, 'search': search})
+        employees = employees.filter(search_filter(search))
+    page = keyset_paginate(request, employees, ['-created_at', '-pk'])
+    return render(request, 'employees/employee_list.html', {'employees': page, 'page': page, 'search': search})
  
 
+@login_required
+@user_passes_test(is_admin)
+def employee_search(request):
+    term = request.GET.get('q', '').strip()
+    try:
+        limit = max(1, min(int(request.GET.get('limit', SEARCH_RESULT_LIMIT)), MAX_SEARCH_RESULT_LIMIT))
+    except ValueError:
+        limit = SEARCH_RESULT_LIMIT
+    results = search_employees(term, limit) if term else []
+    return JsonResponse({'results': results})
+
+
 @login_required
 @user_passes_test(is_admin)
 def employee_create(request):
@@ -255,11 +303,12 @@ def employee_delete(request, pk):
 @login_required
 @user_passes_test(is_admin)
 def attendance_list(request):
-    attendances = Attendance.objects.all().order_by('-date')
+    attendances = Attendance.objects.select_related('employee')
     employee_id = request.GET.get('employee')
     if employee_id:
         attendances = attendances.filter(employee_id=employee_id)
-    return render(request, 'employees/attendance_list.html', {'attendances': attendances})
+    page = keyset_paginate(request, attendances, ['-date', '-pk'])
+    return render(request, 'employees/attendance_list.html', {'attendances': page, 'page': page})
 
 
 @login_required
@@ -276,15 +325,41 @@ def attendance_create(request):
     return render(request, 'employees/attendance_form.html', {'form': form, 'title': 'Add Attendance'})
 
 
+@login_required
+@user_passes_test(is_admin)
+def attendance_import(request):
+    result = None
+    if request.method == 'POST':
+        form = AttendanceImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            # Iterating the upload yields one line at a time, so large files are never read whole
+            lines = (line.decode('utf-8-sig') for line in form.cleaned_data['file'])
+            try:
+                result = import_attendance_csv(lines)
+            except UnicodeDecodeError:
+                messages.error(request, 'The file is not valid UTF-8 text. Nothing was imported.')
+            except csv.Error as e:
+                messages.error(request, f'The file is not valid CSV ({e}). Nothing was imported.')
+            else:
+                messages.success(
+                    request,
+                    f'{result.imported} attendance rows imported, {result.rejected_count} rejected.'
+                )
+    else:
+        form = AttendanceImportForm()
+    return render(request, 'employees/attendance_import.html', {'form': form, 'result': result})
+
+
 # Salary Views
 @login_required
 @user_passes_test(is_admin)
 def salary_list(request):
-    salaries = Salary.objects.all().order_by('-year', '-month')
+    salaries = Salary.objects.select_related('employee')
     employee_id = request.GET.get('employee')
     if employee_id:
         salaries = salaries.filter(employee_id=employee_id)
-    return render(request, 'employees/salary_list.html', {'salaries': salaries})
+    page = keyset_paginate(request, salaries, ['-year', '-month', '-pk'])
+    return render(request, 'employees/salary_list.html', {'salaries': page, 'page': page})
 
 
 @login_required
@@ -318,32 +393,12 @@ def salary_calculate(request, pk):
         employee = salary.employee
         
         # Get attendance for the month
-        start_date = datetime(year, month, 1).date()
-        end_date = datetime(year, month, monthrange(year, month)[1]).date()
-        
-        attendances = Attendance.objects.filter(
-            employee=employee,
-            date__gte=start_date,
-            date__lte=end_date
-        )
-        
-        # Calculate days
+        counts = attendance_counts(year, month, [employee.pk]).get(employee.pk)
         total_days = monthrange(year, month)[1]
-        days_present = attendances.filter(status='present').count()
-        days_absent = attendances.filter(status='absent').count()
-        days_on_leave = attendances.filter(status='leave').count()
-        half_days = attendances.filter(status='half_day').count()
         
-        # Update salary fields
-        salary.total_working_days = total_days
-        salary.days_present = days_present
-        salary.days_absent = days_absent
-        salary.days_on_leave = days_on_leave
-        salary.half_days = half_days
+        # Update salary fields and calculate salary
         salary.base_salary = employee.base_salary
-        
-        # Calculate salary
-        calculated_amount = salary.calculate_salary()
+        apply_attendance(salary, counts, total_days)
         salary.save()
         
         messages.success(request, f'Salary recalculated successfully! Net Salary: ₹{salary.net_salary:,.2f}')
@@ -353,6 +408,44 @@ def salary_calculate(request, pk):
     return redirect('salary_detail', pk=pk)
 
 
+@login_required
+@user_passes_test(is_admin)
+def payroll_run(request):
+    if request.method == 'POST':
+        form = PayrollRunForm(request.POST)
+        if form.is_valid() and form.cleaned_data['background']:
+            job = enqueue('payroll.run', {
+                'month': form.cleaned_data['month'],
+                'year': form.cleaned_data['year'],
+                'restart': form.cleaned_data['restart'],
+            }, user=request.user)
+            messages.info(request, 'Payroll run queued.')
+            return redirect('job_detail', pk=job.pk)
+        elif form.is_valid():
+            run = run_payroll(
+                form.cleaned_data['month'],
+                form.cleaned_data['year'],
+                user=request.user,
+                restart=form.cleaned_data['restart'],
+            )
+            if run.status == 'failed':
+                messages.error(request, 'The payroll run was superseded by a restarted run and stopped.')
+                return redirect('payroll_run')
+            messages.success(
+                request,
+                f'Payroll for {calendar.month_name[run.month]} {run.year} completed: '
+                f'{run.salaries_created} created, {run.salaries_updated} recalculated, '
+                f'{run.salaries_skipped} already paid.'
+            )
+            return redirect('payroll_run')
+    else:
+        now = timezone.now()
+        form = PayrollRunForm(initial={'month': now.month, 'year': now.year})
+    
+    runs = PayrollRun.objects.select_related('started_by')[:10]
+    return render(request, 'employees/payroll_run.html', {'form': form, 'runs': runs})
+
+
 @login_required
 def salary_detail(request, pk):
     salary = get_object_or_404(Salary, pk=pk)
@@ -370,6 +463,23 @@ def salary_detail(request, pk):
     return render(request, 'employees/salary_detail.html', {'salary': salary, 'payment': payment})
 
 
+@login_required
+def salary_payslip(request, pk):
+    salary = get_object_or_404(Salary.objects.select_related('employee'), pk=pk)
+    user = request.user
+    
+    if not user.is_admin_user() and salary.employee.user != user:
+        messages.error(request, 'You do not have permission to view this salary.')
+        return redirect('dashboard')
+    
+    return FileResponse(
+        open(get_payslip(salary), 'rb'),
+        as_attachment=True,
+        filename=f'payslip-{salary.employee.employee_id}-{salary.year}-{salary.month:02d}.pdf',
+        content_type='application/pdf',
+    )
+
+
 # Payment Views
 @login_required
 @user_passes_test(is_admin)
@@ -413,6 +523,62 @@ def payment_process(request, salary_id):
     return render(request, 'employees/payment_form.html', {'form': form, 'salary': salary})
 
 
+@login_required
+@user_passes_test(is_admin)
+def payment_bulk(request):
+    now = timezone.now()
+    month = int(request.GET.get('month', now.month))
+    year = int(request.GET.get('year', now.year))
+    results = None
+    
+    if request.method == 'POST':
+        form = BulkPaymentForm(request.POST)
+        if form.is_valid():
+            month = form.cleaned_data['month']
+            year = form.cleaned_data['year']
+            if request.POST.get('scope') == 'all':
+                salary_ids = list(Salary.objects.filter(
+                    month=month, year=year, is_paid=False
+                ).values_list('pk', flat=True))
+            else:
+                salary_ids = [int(pk) for pk in request.POST.getlist('salary_ids') if pk.isdigit()]
+            
+            if not salary_ids:
+                messages.warning(request, 'No salaries selected for payment.')
+            elif form.cleaned_data['background']:
+                job = enqueue('payments.bulk', {
+                    'salary_ids': salary_ids,
+                    'payment_date': form.cleaned_data['payment_date'].isoformat(),
+                    'payment_method': form.cleaned_data['payment_method'],
+                    'transaction_prefix': form.cleaned_data['transaction_prefix'],
+                    'notes': form.cleaned_data['notes'],
+                }, user=request.user)
+                messages.info(request, f'Payment of {len(salary_ids)} salaries queued.')
+                return redirect('job_detail', pk=job.pk)
+            else:
+                results = pay_salaries(
+                    salary_ids,
+                    form.cleaned_data['payment_date'],
+                    form.cleaned_data['payment_method'],
+                    transaction_prefix=form.cleaned_data['transaction_prefix'],
+                    notes=form.cleaned_data['notes'],
+                    user=request.user,
+                )
+                paid = sum(1 for result in results if result['success'])
+                messages.success(request, f'{paid} of {len(results)} salaries paid successfully!')
+    else:
+        form = BulkPaymentForm(initial={'month': month, 'year': year, 'payment_date': now.date()})
+    
+    salaries = Salary.objects.filter(month=month, year=year, is_paid=False).select_related('employee')
+    return render(request, 'employees/payment_bulk.html', {
+        'form': form,
+        'salaries': salaries,
+        'results': results,
+        'month': month,
+        'year': year,
+    })
+
+
 @login_required
 @user_passes_test(is_admin)
 def payment_mark_unpaid(request, salary_id):
@@ -428,21 +594,25 @@ def payment_mark_unpaid(request, salary_id):
 
 # Transaction History
 @login_required
+@read_from_replica
 def transaction_history(request, employee_id=None):
     user = request.user
     
     if user.is_admin_user():
         if employee_id:
             employee = get_object_or_404(Employee, pk=employee_id)
-            transactions = Transaction.objects.filter(employee=employee).order_by('-transaction_date')
+            transactions = Transaction.objects.filter(employee=employee)
         else:
-            transactions = Transaction.objects.all().order_by('-transaction_date')
+            transactions = Transaction.objects.all()
     else:
         employee = get_object_or_404(Employee, user=user)
-        transactions = Transaction.objects.filter(employee=employee).order_by('-transaction_date')
+        transactions = Transaction.objects.filter(employee=employee)
     
+    transactions = transactions.select_related('employee', 'payment')
+    page = keyset_paginate(request, transactions, ['-transaction_date', '-pk'])
     return render(request, 'employees/transaction_history.html', {
-        'transactions': transactions,
+        'transactions': page,
+        'page': page,
         'employee': employee if employee_id or not user.is_admin_user() else None
     })
 
@@ -450,6 +620,7 @@ def transaction_history(request, employee_id=None):
 # Reports
 @login_required
 @user_passes_test(is_admin)
+@read_from_replica
 def reports(request):
     context = {}
     
@@ -458,7 +629,15 @@ def reports(request):
         month = int(request.GET.get('month', timezone.now().month))
         year = int(request.GET.get('year', timezone.now().year))
         
-        salaries = Salary.objects.filter(month=month, year=year)
+        if request.GET.get('format') in ('csv', 'xlsx'):
+            if request.GET.get('background'):
+                job = enqueue('reports.export', {
+                    'export_format': request.GET['format'], 'report_type': 'monthly', 'year': year, 'month': month,
+                }, user=request.user)
+                return redirect('job_detail', pk=job.pk)
+            return report_export_response(request.GET['format'], 'monthly', year, month)
+        
+        salaries = Salary.objects.filter(month=month, year=year).select_related('employee')
         total_expenditure = salaries.filter(is_paid=True).aggregate(
             total=Sum('net_salary')
         )['total'] or 0
@@ -469,49 +648,146 @@ def reports(request):
             'year': year,
             'salaries': salaries,
             'total_expenditure': total_expenditure,
+            'attendance_totals': attendance_totals(year, month),
         })
     
     # Annual Report
     elif request.GET.get('type') == 'annual':
         year = int(request.GET.get('year', timezone.now().year))
         
-        salaries = Salary.objects.filter(year=year, is_paid=True)
-        total_expenditure = salaries.aggregate(total=Sum('net_salary'))['total'] or 0
+        if request.GET.get('format') in ('csv', 'xlsx'):
+            if request.GET.get('background'):
+                job = enqueue('reports.export', {
+                    'export_format': request.GET['format'], 'report_type': 'annual', 'year': year,
+                }, user=request.user)
+                return redirect('job_detail', pk=job.pk)
+            return report_export_response(request.GET['format'], 'annual', year)
         
         # Monthly breakdown
-        monthly_data = []
-        for month in range(1, 13):
-            month_total = salaries.filter(month=month).aggregate(
-                total=Sum('net_salary')
-            )['total'] or 0
-            monthly_data.append({
-                'month': calendar.month_name[month],
-                'total': month_total
-            })
+        monthly_data, total_expenditure = annual_breakdown(monthly_total_rows((year, 1), (year, 12)), year)
         
         context.update({
             'report_type': 'annual',
             'year': year,
-            'salaries': salaries,
+            'pivot_rows': annual_pivot(year),
             'total_expenditure': total_expenditure,
             'monthly_data': monthly_data,
+            'payment_methods': [label for _, label in Payment.PAYMENT_METHOD_CHOICES],
         })
     
     return render(request, 'employees/reports.html', context)
 
 
+@login_required
+@user_passes_test(is_admin)
+@read_from_replica
+async def reports_async(request):
+    """reports with its independent queries running concurrently (for asgi.py)"""
+    if request.GET.get('format') or request.GET.get('type') not in ('monthly', 'annual'):
+        return await sync_to_async(reports)(request)
+    
+    now = timezone.now()
+    year = int(request.GET.get('year', now.year))
+    
+    if request.GET['type'] == 'monthly':
+        month = int(request.GET.get('month', now.month))
+        salaries = Salary.objects.filter(month=month, year=year)
+        salary_list, total_expenditure, attendance = await gather_queries(
+            lambda: list(salaries.select_related('employee')),
+            lambda: salaries.filter(is_paid=True).aggregate(total=Sum('net_salary'))['total'] or 0,
+            lambda: attendance_totals(year, month),
+        )
+        context = {
+            'report_type': 'monthly',
+            'month': month,
+            'year': year,
+            'salaries': salary_list,
+            'total_expenditure': total_expenditure,
+            'attendance_totals': attendance,
+        }
+    else:
+        rows = await sync_to_async(monthly_total_rows, thread_sensitive=False)((year, 1), (year, 12))
+        monthly_data, total_expenditure = await run_in_thread(annual_breakdown, rows, year)
+        context = {
+            'report_type': 'annual',
+            'year': year,
+            'pivot_rows': annual_pivot(year),
+            'total_expenditure': total_expenditure,
+            'monthly_data': monthly_data,
+            'payment_methods': [label for _, label in Payment.PAYMENT_METHOD_CHOICES],
+        }
+    
+    request.user = await request.auser()
+    return await sync_to_async(render)(request, 'employees/reports.html', context)
+
+
+# Background Jobs
+@login_required
+@user_passes_test(is_admin)
+def job_list(request):
+    jobs = Job.objects.select_related('created_by')[:50]
+    return render(request, 'employees/job_list.html', {'jobs': jobs})
+
+
+@login_required
+@user_passes_test(is_admin)
+def job_detail(request, pk):
+    job = get_object_or_404(Job, pk=pk)
+    return render(request, 'employees/job_detail.html', {'job': job})
+
+
+@login_required
+@user_passes_test(is_admin)
+def job_status(request, pk):
+    job = get_object_or_404(Job, pk=pk)
+    return JsonResponse({
+        'id': job.pk,
+        'name': job.name,
+        'status': job.status,
+        'finished': job.is_finished,
+        'progress': job.progress,
+        'total': job.total,
+        'percent': job.percent,
+        'message': job.message,
+        'attempts': job.attempts,
+        'max_attempts': job.max_attempts,
+        'result': job.result,
+        'error': job.error.strip().splitlines()[-1] if job.error else '',
+    })
+
+
+@login_required
+@user_passes_test(is_admin)
+def job_download(request, pk):
+    job = get_object_or_404(Job, pk=pk, status='succeeded')
+    if not job.result or 'file' not in job.result:
+        messages.error(request, 'This job has no file to download.')
+        return redirect('job_detail', pk=pk)
+    # Exports hold everyone's pay, so they are only ever served from here
+    path = Path(settings.PRIVATE_MEDIA_ROOT) / job.result['file']
+    if not path.is_file():
+        messages.error(request, 'The exported file is no longer available.')
+        return redirect('job_detail', pk=pk)
+    return FileResponse(
+        open(path, 'rb'),
+        as_attachment=True,
+        filename=job.result['filename'],
+    )
+
+
 # Notifications
 @login_required
 def notifications(request):
     user = request.user
     
     if user.is_admin_user():
-        notifications_list = Notification.objects.all().order_by('-created_at')
+        notifications_list = Notification.objects.all()
     else:
         employee = get_object_or_404(Employee, user=user)
-        notifications_list = Notification.objects.filter(employee=employee).order_by('-created_at')
+        notifications_list = Notification.objects.filter(employee=employee)
     
-    return render(request, 'employees/notifications.html', {'notifications': notifications_list})
+    page = keyset_paginate(request, notifications_list, ['-created_at', '-pk'])
+    return render(request, 'employees/notifications.html', {'notifications': page, 'page': page})
 
 
 @login_required
@@ -524,6 +800,76 @@ def notification_mark_read(request, notification_id):
         messages.error(request, 'You do not have permission.')
         return redirect('dashboard')
     
-    notification.is_read = True
-    notification.save()
+    mark_read(notification)
     return redirect('notifications')
+
+
+@login_required
+async def notification_stream(request):
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI an open stream would hold a worker forever; 204 tells EventSource to stop
+        return HttpResponse(status=204)
+    
+    user = await request.auser()
+    employee_id = await Employee.objects.filter(user=user).values_list('pk', flat=True).afirst()
+    if employee_id is None:
+        return HttpResponse(status=204)
+    
+    last_id = request.headers.get('Last-Event-ID', '')
+    response = StreamingHttpResponse(
+        notification_events(user.pk, employee_id, int(last_id) if last_id.isdigit() else None),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@login_required
+def notification_mark_all_read(request):
+    user = request.user
+    if request.method == 'POST':
+        # Only the user's own notifications, admins included
+        employee = Employee.objects.filter(user=user).first()
+        if employee is None:
+            messages.info(request, 'You have no notifications of your own to mark as read.')
+        else:
+            updated = mark_all_read(employee)
+            messages.success(request, f'{updated} notifications marked as read.')
+    return redirect('notifications')
+
+
+@login_required
+@user_passes_test(is_admin)
+def notification_broadcast(request):
+    if request.method == 'POST':
+        form = NotificationBroadcastForm(request.POST)
+        if form.is_valid():
+            recipients = Employee.objects.filter(is_active=True)
+            if form.cleaned_data['department']:
+                recipients = recipients.filter(department=form.cleaned_data['department'])
+            sent = broadcast(
+                recipients,
+                form.cleaned_data['notification_type'],
+                form.cleaned_data['title'],
+                form.cleaned_data['message'],
+            )
+            messages.success(request, f'Notification sent to {sent} employees.')
+            return redirect('notifications')
+    else:
+        now = timezone.now()
+        form = NotificationBroadcastForm(initial={
+            'notification_type': 'salary_pending',
+            'title': 'Salary Pending',
+            'message': f'Salaries for {calendar.month_name[now.month]} {now.year} are pending.',
+        })
+    
+    departments = Employee.objects.filter(is_active=True).order_by().values_list('department', flat=True).distinct()
+    return render(request, 'employees/notification_broadcast.html', {'form': form, 'departments': departments})
+
+
+# Metrics
+@login_required
+@user_passes_test(is_admin)
+def metrics(request):
+    return HttpResponse(registry.expose(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,67 @@
+"""
+Work a process would otherwise do on its first requests, done up front.
+
+gunicorn.conf.py runs warm_up() in the master once the app is preloaded, so
+every forked worker starts with routes resolved, templates compiled and
+model metadata built. Nothing here touches the database.
+"""
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.db import connections
+from django.template import engines
+from django.urls import get_resolver, resolve, reverse
+
+from . import urls
+
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / 'templates'
+
+# Sample values for path converters when reversing routes
+CONVERTER_SAMPLES = {'IntConverter': 1, 'StringConverter': 'x', 'SlugConverter': 'x', 'UUIDConverter': '0' * 32}
+
+
+def resolve_routes():
+    """Reverse and resolve every route of employees/urls.py; returns how many"""
+    # Builds the reverse lookup tables of the whole URLconf, admin included
+    get_resolver().reverse_dict
+    for pattern in urls.urlpatterns:
+        kwargs = {
+            name: CONVERTER_SAMPLES.get(type(converter).__name__, 1)
+            for name, converter in pattern.pattern.converters.items()
+        }
+        resolve(reverse(pattern.name, kwargs=kwargs))
+    return len(urls.urlpatterns)
+
+
+def compile_templates():
+    """Compile every employees/ template into the cached loader; returns how many"""
+    engine = engines['django']
+    names = [path.relative_to(TEMPLATE_DIR).as_posix() for path in sorted(TEMPLATE_DIR.rglob('*.html'))]
+    for name in names:
+        engine.get_template(name)
+    return len(names)
+
+
+def prime_models():
+    """Build the field, relation and manager caches of every model; returns how many"""
+    models = apps.get_models()
+    for model in models:
+        model._meta.get_fields()
+        model._meta.related_objects
+        model._meta.concrete_fields
+        model._meta.managers
+    return len(models)
+
+
+def warm_up():
+    """Run every step and return {step: (count, seconds)}"""
+    timings = {}
+    for name, step in (('routes', resolve_routes), ('templates', compile_templates), ('models', prime_models)):
+        started = time.perf_counter()
+        count = step()
+        timings[name] = (count, time.perf_counter() - started)
+    # Forked workers must not share a connection opened by the master
+    connections.close_all()
+    return timings
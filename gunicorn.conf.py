@@ -0,0 +1,27 @@
+"""
+gunicorn settings, read from ./gunicorn.conf.py.
+
+The app is loaded once in the master (preload_app) and warmed up there
+before any worker is forked, so workers share that memory copy-on-write
+and answer their first request without paying for imports, URL
+resolution or template compilation. Workers (WEB_CONCURRENCY) and bind
+address ($PORT) come from gunicorn's usual environment variables; set
+WARM_UP=0 to skip the warm-up.
+"""
+import os
+
+
+wsgi_app = 'payment_management.wsgi:application'
+
+preload_app = True
+
+
+def when_ready(server):
+    # Runs in the master after the app is loaded and before workers fork
+    if os.environ.get('WARM_UP', '1') != '1':
+        return
+
+    from employees.warmup import warm_up
+
+    for step, (count, seconds) in warm_up().items():
+        server.log.info("Warmed up %d %s in %.0f ms", count, step, seconds * 1000)
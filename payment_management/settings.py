@@ -43,6 +43,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'employees.metrics.MetricsMiddleware',
+    'employees.routers.ReplicaPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -63,6 +65,8 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'employees.context_processors.notifications',
+                'employees.context_processors.fragment_cache',
             ],
         },
     },
@@ -87,7 +91,7 @@ if DATABASE_URL:
         'default': dj_database_url.parse(
             DATABASE_URL,
             conn_max_age=600,
-            ssl_require=True
+            ssl_require=not DATABASE_URL.startswith('sqlite')
         )
     }
 else:
@@ -99,6 +103,208 @@ else:
     }
 
 
+# Read replica
+# With REPLICA_DATABASE_URL set, reports, exports, transaction history and the
+# admin dashboard figures read from the replica; everything else, and every
+# write, uses the primary. A user who writes reads from the primary for
+# REPLICA_PIN_SECONDS afterwards, which should cover the replication lag.
+# Tests run against the primary alone (TEST MIRROR).
+
+REPLICA_DATABASE_URL = os.environ.get("REPLICA_DATABASE_URL")
+REPLICA_PIN_SECONDS = 10
+
+if REPLICA_DATABASE_URL:
+    DATABASES['replica'] = dj_database_url.parse(
+        REPLICA_DATABASE_URL,
+        conn_max_age=600,
+        ssl_require=not REPLICA_DATABASE_URL.startswith('sqlite'),
+    )
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = ['employees.routers.ReplicaRouter']
+
+
+# Connection pooling
+# With DATABASE_POOL=1, each process shares a psycopg pool of
+# DATABASE_POOL_MIN_SIZE to DATABASE_POOL_MAX_SIZE PostgreSQL connections
+# between its threads, instead of keeping one persistent connection per
+# thread. A request waits up to DATABASE_POOL_TIMEOUT seconds for a free
+# connection. Idle connections above the minimum are closed after
+# DATABASE_POOL_MAX_IDLE seconds, and every connection is replaced after
+# DATABASE_POOL_MAX_LIFETIME. Unless DATABASE_POOL_CHECK=0, the pool checks
+# each connection before handing it out and replaces a broken one. Needs
+# psycopg 3 with the pool extra (psycopg_pool 3.2 or later for the check).
+
+DATABASE_POOL = os.environ.get("DATABASE_POOL") == "1"
+
+if DATABASE_POOL:
+    for database in DATABASES.values():
+        if database['ENGINE'] == 'django.db.backends.postgresql':
+            # The pool keeps the connections open
+            database['CONN_MAX_AGE'] = 0
+            pool = database.setdefault('OPTIONS', {})['pool'] = {
+                'min_size': int(os.environ.get("DATABASE_POOL_MIN_SIZE", 2)),
+                'max_size': int(os.environ.get("DATABASE_POOL_MAX_SIZE", 10)),
+                'timeout': float(os.environ.get("DATABASE_POOL_TIMEOUT", 10)),
+                'max_idle': float(os.environ.get("DATABASE_POOL_MAX_IDLE", 300)),
+                'max_lifetime': float(os.environ.get("DATABASE_POOL_MAX_LIFETIME", 3600)),
+            }
+            # Django's CONN_HEALTH_CHECKS does not apply to pooled connections
+            if os.environ.get("DATABASE_POOL_CHECK", "1") == "1":
+                from psycopg_pool import ConnectionPool
+
+                pool['check'] = ConnectionPool.check_connection
+
+
+# SQLite
+# SQLite databases are tuned for concurrent requests: WAL journaling lets
+# readers work while a write is in progress, and transactions start with
+# BEGIN IMMEDIATE, so writers take the write lock up front and queue for it
+# (for up to SQLITE_BUSY_TIMEOUT milliseconds). A deferred transaction that
+# reads first cannot wait for the lock, and fails with "database is locked".
+# SQLITE_PRAGMAS are applied to each new connection. SQLITE_TUNING=0 keeps
+# SQLite's defaults.
+#
+# WAL mode is recorded in the database file itself, so the first tuned
+# connection converts a database for good (the bundled db.sqlite3 is already
+# converted). synchronous=NORMAL only syncs the WAL to disk at checkpoints:
+# the database never corrupts, but a power loss or OS crash can undo the
+# last transactions committed before it, payments included. A crash of the
+# app alone loses nothing. SQLITE_SYNCHRONOUS=FULL syncs every commit, at
+# the cost of write throughput.
+
+SQLITE_TUNING = os.environ.get("SQLITE_TUNING", "1") == "1"
+SQLITE_BUSY_TIMEOUT = 20000
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+    'busy_timeout': SQLITE_BUSY_TIMEOUT,
+    'mmap_size': 256 * 1024 * 1024,
+    # Negative sizes are in KiB
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+if SQLITE_TUNING:
+    for database in DATABASES.values():
+        if database['ENGINE'] == 'django.db.backends.sqlite3':
+            database.setdefault('OPTIONS', {})['transaction_mode'] = 'IMMEDIATE'
+
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# In-process memory by default; set CACHE_BACKEND=file when running several
+# gunicorn workers so invalidations are shared between them. Keys are
+# prefixed with the deployed release (CACHE_KEY_PREFIX, or the commit on
+# Render), so a deploy never serves pages or fragments cached by the
+# previous one. Up to CACHE_MAX_ENTRIES entries are kept.
+
+CACHE_KEY_PREFIX = os.environ.get("CACHE_KEY_PREFIX") or os.environ.get("RENDER_GIT_COMMIT", "")[:12]
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", 10000))
+
+if os.environ.get("CACHE_BACKEND") == "file":
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get("CACHE_LOCATION", BASE_DIR / ".cache"),
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            'OPTIONS': {'MAX_ENTRIES': CACHE_MAX_ENTRIES},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'payease',
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            'OPTIONS': {'MAX_ENTRIES': CACHE_MAX_ENTRIES},
+        }
+    }
+
+# With a shared cache, sessions are read from it and written through to the
+# database, so they survive a cache flush or a deploy. An in-process cache
+# would keep serving a session in every other worker after it was logged
+# out or flushed in one, so sessions then stay in the database alone.
+if os.environ.get("CACHE_BACKEND") == "file":
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+
+# Seconds the public home page is served from the cache to visitors who are
+# not logged in
+HOME_CACHE_TIMEOUT = 3600
+
+# Seconds the navbar, sidebar and dashboard card fragments are cached. Their
+# keys include whatever they depend on (user, page, dashboard version), so
+# changes show up at once; with the in-process cache, changes made in
+# another process show up once the dashboard version expires
+# (DASHBOARD_CACHE_TIMEOUT).
+FRAGMENT_CACHE_TIMEOUT = 3600
+
+# Seconds the admin dashboard figures may be served from the cache. Salary,
+# payment and employee changes invalidate them immediately.
+DASHBOARD_CACHE_TIMEOUT = 300
+
+# Seconds a user's unread notification count may be cached. The count is
+# adjusted whenever notifications are created or read, but with the
+# in-process cache only in the process that made the change: other gunicorn
+# workers and run_worker jobs are caught up by the short timeout. A shared
+# cache (CACHE_BACKEND=file) sees every adjustment and keeps counts longer.
+UNREAD_COUNT_CACHE_TIMEOUT = int(os.environ.get(
+    "UNREAD_COUNT_CACHE_TIMEOUT", 3600 if os.environ.get("CACHE_BACKEND") == "file" else 30
+))
+
+
+# Live notifications
+# /notifications/stream/ pushes new notifications as server-sent events when
+# the app is served through asgi.py. Streams send a heartbeat every
+# NOTIFICATION_STREAM_HEARTBEAT seconds, and an idle stream does no database
+# work. Notifications created by other processes (e.g. the job worker) are
+# sent when the browser reconnects with its Last-Event-ID; set
+# NOTIFICATION_STREAM_CATCHUP=1 to also check the database on every
+# heartbeat, at the cost of one query per open stream each time.
+
+NOTIFICATION_STREAM_HEARTBEAT = 25
+NOTIFICATION_STREAM_CATCHUP = os.environ.get("NOTIFICATION_STREAM_CATCHUP", "0") == "1"
+
+
+# Pagination
+# List views use keyset (cursor) pagination; ?page_size= may override
+# PAGE_SIZE up to MAX_PAGE_SIZE.
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+# Background jobs
+# Long operations are queued as Job rows and run by `manage.py run_worker`.
+# A failed job is retried after JOB_RETRY_DELAY seconds, doubling each time,
+# up to its max_attempts. A running job that reports no progress for
+# JOB_STALE_TIMEOUT seconds is assumed lost and requeued.
+
+JOB_WORKERS = 4
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_DELAY = 30
+JOB_STALE_TIMEOUT = 900
+
+
+# Async views
+# With ASYNC_VIEWS=1 the dashboard and reports pages use async views that run
+# their independent queries concurrently. Only worth it when serving asgi.py.
+
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS") == "1"
+
+
+# Metrics
+# Each request's latency, query count and time, and template render time are
+# recorded per URL name and served to admins in Prometheus text format at
+# /metrics/. Figures are kept per process. A request that runs the same SQL
+# METRICS_N_PLUS_ONE_THRESHOLD or more times is counted and logged as a
+# likely N+1. Set METRICS_ENABLED=0 to switch it all off.
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+METRICS_N_PLUS_ONE_THRESHOLD = 10
 
 
 # Password validation
@@ -144,6 +350,11 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Generated files with pay and bank details (payslips, report exports). Kept out of
+# MEDIA_ROOT, which is served to anyone, and only handed out by views that
+# check permissions
+PRIVATE_MEDIA_ROOT = Path(os.environ.get("PRIVATE_MEDIA_ROOT", BASE_DIR / 'private'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 